@@ -4,140 +4,746 @@ along with a sudoku class that can handle events.
 """
 
 # Imports
-from random import shuffle, randrange
+from itertools import islice
+import random
+from random import Random
+from threading import Event, Thread
+from time import perf_counter
+from SudokuDLX import DancingLinks
 
 # Make a list of numbers to choose from, to randomly fill the grid
 AVAILABLE_NUMBERS = [1, 2, 3, 4, 5, 6, 7, 8, 9]
 AVAILABLE_POSITIONS = [(i, j) for j in range(9) for i in range(9)]
 
-# Keep track of number of solutions to a given sudoku board
-no_of_solutions = 0
+# Boards are stored flat, row by row, so that position (x,y) is at index y * 9 + x
+# (the same order as AVAILABLE_POSITIONS)
+ROW_OF = [i // 9 for i in range(81)]
+COLUMN_OF = [i % 9 for i in range(81)]
+BOX_OF = [i // 27 * 3 + i % 9 // 3 for i in range(81)]
+
+# Precomputed lookup tables for the constraint engine
+ALL_NUMBERS_MASK = sum(1 << n for n in range(1, 10))
+PEERS = [tuple(j for j in range(81) if j != i and (ROW_OF[j] == ROW_OF[i] or COLUMN_OF[j] == COLUMN_OF[i] or
+                                                   BOX_OF[j] == BOX_OF[i]))
+         for i in range(81)]
+UNITS = ([[i for i in range(81) if ROW_OF[i] == r] for r in range(9)] +
+         [[i for i in range(81) if COLUMN_OF[i] == c] for c in range(9)] +
+         [[i for i in range(81) if BOX_OF[i] == b] for b in range(9)])
+# The row, column and box (as indices into UNITS) that each position belongs to
+UNITS_OF = [(ROW_OF[i], 9 + COLUMN_OF[i], 18 + BOX_OF[i]) for i in range(81)]
+NO_OF_CANDIDATES = [bin(mask).count("1") for mask in range(ALL_NUMBERS_MASK + 1)]
+
+# Characters used to write the cells of a board as text
+BOARD_CHARACTERS = bytes.maketrans(bytes(range(10)), b".123456789")
+
+# Names of the unit kinds, in the order of UNITS
+UNIT_KINDS = ("Row", "Column", "Box")
+
+# The solver engines that can be used, and the one used when none is given
+SOLVER_BACKENDS = ("backtracking", "dlx")
+DEFAULT_SOLVER_BACKEND = "backtracking"
+
+# Version of the puzzle generator, part of every puzzle ID. It is raised whenever a change to the solver or
+# the generator changes the puzzle generated from a seed, so the puzzles cached for old IDs are not used
+GENERATOR_VERSION = 1
+
+
+class Difficulty:
+    """
+    This is a class containing the difficulty values for the sudoku puzzle
+    """
+    Easy = 10
+    Medium = 20
+    Hard = 30
+    Expert = 40
+
+
+class Board:
+    """
+    This is a 9x9 sudoku board stored as 81 bytes, row by row, so position (x,y) is at cells[y * 9 + x].
+    board[x][y] still reads and writes the cells, through a view of the x-th column.
+    """
+    __slots__ = ("cells",)
+
+    def __init__(self, cells=bytes(81)):
+        """
+        Initializes the board with a copy of the cells
+        :param cells: Iterable[int]
+        """
+
+        self.cells = bytearray(cells)
+
+    def __getitem__(self, x):
+        return memoryview(self.cells)[x::9]
+
+    def __iter__(self):
+        return (self[x] for x in range(9))
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.cells == other.cells
+
+    __hash__ = None
+
+    def copy(self):
+        """
+        Returns a duplicate of the board, copying the cells in one go
+        :return: Board
+        """
+
+        return Board(self.cells)
+
+    def count(self, n):
+        """
+        Returns the number of positions holding n
+        :param n: int
+        :return: int
+        """
+
+        return self.cells.count(n)
 
 
 def create_empty_sudoku_board():
     """
     Creates and returns an empty 9x9 Sudoku board
-    :return: List[List[0]]
+    :return: Board
     """
 
-    return [[0 for _ in range(9)] for _ in range(9)]
+    return Board()
 
 
 def create_duplicate_board(board):
     """
     Gets a board and returns a duplicate of the board, with a different memory address
-    :param board: List[List[int]]
-    :return: List[List[int]]
+    :param board: Board
+    :return: Board
+    """
+
+    return board.copy()
+
+
+def board_to_string(board):
     """
+    Writes a board as a line of 81 characters, row by row, with "." for empty positions
+    :param board: Board
+    :return: str
+    """
+
+    return board.cells.translate(BOARD_CHARACTERS).decode()
+
 
-    dup_board = create_empty_sudoku_board()
-    for i, j in AVAILABLE_POSITIONS:
-        dup_board[i][j] = board[i][j]
-    return dup_board
+def board_from_string(text):
+    """
+    Reads a board written as a line of 81 characters, row by row, with "." or "0" for empty positions
+    :param text: str
+    :return: Board
+    """
+
+    text = text.strip()
+    if len(text) != 81:
+        raise ValueError(f"Expected 81 characters for a sudoku board, got {len(text)}")
+
+    return Board(0 if character == "." else int(character) for character in text)
 
 
 def check_for_placement(board, x, y, n):
     """
     Check if n can be placed in the board at position (x,y)
-    :param board: List[List[int]]
+    :param board: Board
     :param x: int
     :param y: int
     :param n: int
     :return: bool
     """
 
-    row_placement = n not in board[x]
-    column_placement = n not in [board[i][y] for i in range(9)]
-    box_placement = n not in [board[i][j] for i in range(x//3*3, x//3*3+3) for j in range(y//3*3, y//3*3+3)]
-
-    return row_placement and column_placement and box_placement
+    cells = board.cells
+    i = y * 9 + x
+    return cells[i] != n and all(cells[j] != n for j in PEERS[i])
 
 
 def check_for_full_grid(board):
     """
     Checks if every position has a number filled
-    :param board: List[List[int]]
+    :param board: Board
     :return: bool
     """
 
-    return 0 not in [board[x][y] for x, y in AVAILABLE_POSITIONS]
+    return 0 not in board.cells
+
+
+"""
+This is the constraint engine used by the solver. The numbers used in every row, column
+and box are kept as integer bitmasks (bit n is set if n is already used), which are updated
+as numbers are placed and removed, so checking a placement never has to scan the board.
+Positions are indexes into the cells of the board.
+"""
+
+
+class ConstraintGrid:
+    def __init__(self, board):
+        """
+        Builds the row, column and box bitmasks of a board
+        :param board: Board
+        """
+
+        self.board = board
+        self.cells = board.cells
+        self.rows = [0] * 9
+        self.columns = [0] * 9
+        self.boxes = [0] * 9
+        self.empty_positions = []
+        self.is_valid = True
 
+        for i, n in enumerate(self.cells):
+            if n == 0:
+                self.empty_positions.append(i)
+            elif self.can_place(i, n):
+                self.place(i, n)
+            else:
+                # The board already breaks the rules of sudoku
+                self.is_valid = False
+
+    def candidates(self, i):
+        """
+        Returns the bitmask of numbers that can be placed at position i
+        :param i: int
+        :return: int
+        """
+
+        return ALL_NUMBERS_MASK & ~(self.rows[ROW_OF[i]] | self.columns[COLUMN_OF[i]] | self.boxes[BOX_OF[i]])
+
+    def can_place(self, i, n):
+        """
+        Check if n can be placed at position i
+        :param i: int
+        :param n: int
+        :return: bool
+        """
 
-def solve_sudoku(board):
+        return not (self.rows[ROW_OF[i]] | self.columns[COLUMN_OF[i]] | self.boxes[BOX_OF[i]]) & (1 << n)
+
+    def place(self, i, n):
+        """
+        Places n at position i and marks it as used in the row, column and box
+        :param i: int
+        :param n: int
+        :return: None
+        """
+
+        bit = 1 << n
+        self.cells[i] = n
+        self.rows[ROW_OF[i]] |= bit
+        self.columns[COLUMN_OF[i]] |= bit
+        self.boxes[BOX_OF[i]] |= bit
+
+    def unplace(self, i):
+        """
+        Removes the number at position i and frees it in the row, column and box
+        :param i: int
+        :return: None
+        """
+
+        bit = ~(1 << self.cells[i])
+        self.cells[i] = 0
+        self.rows[ROW_OF[i]] &= bit
+        self.columns[COLUMN_OF[i]] &= bit
+        self.boxes[BOX_OF[i]] &= bit
+
+    def undo(self, trail):
+        """
+        Removes the numbers at the positions in the trail, latest first
+        :param trail: List[int]
+        :return: None
+        """
+
+        while trail:
+            self.unplace(trail.pop())
+
+    def propagate(self, trail):
+        """
+        Places the numbers forced by naked singles (a position with one candidate) and hidden
+        singles (a number with one position left in a row, column or box) until none are left.
+        The positions filled are appended to the trail
+        :param trail: List[int]
+        :return: bool (False if the board turns out to have no solution)
+        """
+
+        cells, rows, columns, boxes = self.cells, self.rows, self.columns, self.boxes
+        changed = True
+        while changed:
+            changed = False
+
+            # Naked singles
+            for i in self.empty_positions:
+                if cells[i] == 0:
+                    candidates = ALL_NUMBERS_MASK & ~(rows[ROW_OF[i]] | columns[COLUMN_OF[i]] | boxes[BOX_OF[i]])
+                    if candidates == 0:
+                        return False
+                    if NO_OF_CANDIDATES[candidates] == 1:
+                        self.place(i, candidates.bit_length() - 1)
+                        trail.append(i)
+                        changed = True
+
+            # Naked singles are cheaper to find, so hidden singles are only looked for once they run out
+            if changed:
+                continue
+
+            # Hidden singles
+            for unit in UNITS:
+                placed = once = twice = 0
+                for i in unit:
+                    if cells[i] == 0:
+                        candidates = ALL_NUMBERS_MASK & ~(rows[ROW_OF[i]] | columns[COLUMN_OF[i]] | boxes[BOX_OF[i]])
+                        twice |= once & candidates
+                        once |= candidates
+                    else:
+                        placed |= 1 << cells[i]
+
+                # Some number has no position left in the unit
+                if once | placed != ALL_NUMBERS_MASK:
+                    return False
+
+                singles = once & ~twice
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    for i in unit:
+                        if cells[i] == 0 and self.candidates(i) & bit:
+                            self.place(i, bit.bit_length() - 1)
+                            trail.append(i)
+                            changed = True
+                            break
+                    else:
+                        # The only position for the number was taken by another hidden single
+                        return False
+
+        return True
+
+    def select_position(self):
+        """
+        Returns the empty position with the fewest candidates, or None if the board is full
+        :return: int
+        """
+
+        cells, rows, columns, boxes = self.cells, self.rows, self.columns, self.boxes
+        best_position = None
+        best_count = 10
+        for i in self.empty_positions:
+            if cells[i] == 0:
+                count = NO_OF_CANDIDATES[ALL_NUMBERS_MASK & ~(rows[ROW_OF[i]] | columns[COLUMN_OF[i]] | boxes[BOX_OF[i]])]
+                if count < best_count:
+                    best_position, best_count = i, count
+                    if count <= 2:
+                        break
+        return best_position
+
+
+class SolverStats:
     """
-    Solves a sudoku board using backtracking
-    :param board: List[List[int]]
-    :return: bool
+    This is a class containing the amount of work done by the solver
     """
+    def __init__(self):
+        self.nodes = 0
+        self.forced_placements = 0
+        self.solutions = 0
 
-    # If the board is already full or is completely generated
-    global no_of_solutions
-    if check_for_full_grid(board):
-        no_of_solutions += 1
-        return True
 
-    # Bring randomness to the board generation
-    shuffle(AVAILABLE_NUMBERS)
+class Solver:
+    """
+    This is a sudoku solver and generator that owns all of its state: the solver engine, the random number
+    generator that orders the candidates, and the counters of the work done. Solvers share no state, so
+    puzzles can be solved and generated by many solvers at once, one for every thread or task.
+    A solver itself is not shared between threads.
+    """
+    def __init__(self, backend="backtracking", rng=None, stats=None):
+        """
+        Initializes the solver
+        :param backend: str (one of SOLVER_BACKENDS)
+        :param rng: random.Random (default: a new one, seeded from the system)
+        :param stats: SolverStats (counters to add the work done to, default: new ones)
+        """
 
-    # Procedurally generate the numbers following the constraints of Sudoku
-    for i, j in AVAILABLE_POSITIONS:
-        if board[i][j] == 0:
-            for n in AVAILABLE_NUMBERS:
-                # Check if n is not in the row, column or in the corresponding 3x3 box
-                if check_for_placement(board, i, j, n):
-                    board[i][j] = n
+        if backend not in SOLVER_BACKENDS:
+            raise ValueError(f"Unknown solver backend {backend!r}, expected one of {SOLVER_BACKENDS}")
+        self.backend = backend
+        self.random = Random() if rng is None else rng
+        self.stats = SolverStats() if stats is None else stats
 
-                    if solve_sudoku(board):
-                        return True
+    def spawn(self, seed=None):
+        """
+        Returns a new solver with the same backend and its own random number generator, seeded with the seed,
+        or from this one if there is none
+        :param seed: int
+        :return: Solver
+        """
 
-                    board[i][j] = 0
+        return Solver(self.backend, Random(self.random.getrandbits(64) if seed is None else seed))
 
+    def iterate_solutions(self, board, randomize=False):
+        """
+        Yields the solutions of a sudoku board one at a time, as they are found, without changing the board
+        The search runs on an explicit stack, so it has no recursion limit, and it is paused between solutions:
+        only as many solutions are searched for as are taken from the generator.
+        Every node propagates the forced numbers and then branches on the position with the fewest candidates
+        :param board: Board
+        :param randomize: bool (try the candidates of every position in a random order)
+        :return: Iterator[Board]
+        """
+
+        stats, shuffle = self.stats, self.random.shuffle
+        grid = ConstraintGrid(create_duplicate_board(board))
+        if not grid.is_valid:
+            return
+
+        # Every node on the stack is (positions filled by propagation, position branched on, numbers left to try)
+        # The position is None for a node that failed propagation or found a solution, which has nothing to try
+        stack = []
+        while True:
+            stats.nodes += 1
+            trail = []
+            position = None
+            numbers = []
+            if grid.propagate(trail):
+                stats.forced_placements += len(trail)
+                position = grid.select_position()
+
+                if position is None:
+                    stats.solutions += 1
+                    yield create_duplicate_board(grid.board)
+                else:
+                    candidates = grid.candidates(position)
+                    numbers = [n for n in AVAILABLE_NUMBERS if candidates & (1 << n)]
+                    # Bring randomness to the board generation
+                    if randomize:
+                        shuffle(numbers)
+                    # Numbers are taken from the end
+                    numbers.reverse()
+            stack.append((trail, position, numbers))
+
+            # Place the next number of the deepest node that has one left, backtracking out of the others
+            while stack:
+                trail, position, numbers = stack[-1]
+                if position is not None and grid.cells[position] != 0:
+                    grid.unplace(position)
+                if numbers:
+                    grid.place(position, numbers.pop())
+                    break
+                grid.undo(trail)
+                stack.pop()
+            else:
+                return
+
+    def solve(self, board):
+        """
+        Solves a sudoku board, trying the candidates in a random order
+        :param board: Board
+        :return: bool
+        """
+
+        if self.backend == "dlx":
+            links = DancingLinks(board, randomize=True, rng=self.random)
+            solved = links.solve()
+            self.stats.nodes += links.nodes
+            self.stats.solutions += solved
+            return solved
+
+        # Procedurally generate the numbers following the constraints of Sudoku
+        solution = next(self.iterate_solutions(board, True), None)
+        if solution is None:
             return False
+        board.cells[:] = solution.cells
+        return True
+
+    def count_solutions(self, board, limit=2):
+        """
+        Counts the solutions of a sudoku board, stopping as soon as limit solutions are found
+        The board is left unchanged
+        :param board: Board
+        :param limit: int
+        :return: int
+        """
+
+        if self.backend == "dlx":
+            links = DancingLinks(board)
+            count = links.count_solutions(limit)
+            self.stats.nodes += links.nodes
+            self.stats.solutions += count
+            return count
+
+        return sum(1 for _ in islice(self.iterate_solutions(board), limit))
+
+    def generate_sudoku(self, board, n, should_stop=None):
+        """
+        Procedurally removes n numbers from a solved sudoku grid to create a one-way solvable sudoku puzzle
+        Fewer numbers are removed if no more can be taken out without losing the unique solution, or once
+        should_stop returns True, which is asked before every removal
+        :param board: Board
+        :param n: int
+        :param should_stop: Callable[[], bool]
+        :return: None
+        """
+
+        free_positions = list(range(81))
+
+        while n > 0 and free_positions and not (should_stop and should_stop()):
+            i = free_positions.pop(self.random.randrange(len(free_positions)))
+            temp_number = board.cells[i]
+            board.cells[i] = 0
+
+            # If the puzzle is no longer one-way solvable, then put the number back.
+            # Removing more numbers can only add solutions, so the position is not tried again
+            if self.count_solutions(board) != 1:
+                board.cells[i] = temp_number
+            else:
+                n -= 1
+
+    def generate_puzzle(self, difficulty, deadline=None, is_cancelled=None):
+        """
+        Generates a solved sudoku grid and a one-way solvable puzzle with difficulty numbers removed from it
+        Past the deadline (a time.perf_counter() value), the puzzle with the most numbers removed so far is
+        returned instead, which is still one-way solvable. At least one puzzle is always finished.
+        Once is_cancelled returns True, None is returned
+        :param difficulty: int
+        :param deadline: float
+        :param is_cancelled: Callable[[], bool]
+        :return: Tuple[Board, Board]
+        """
+
+        best = None
+        while True:
+            completed = create_empty_sudoku_board()
+            self.solve(completed)
+            puzzle = create_duplicate_board(completed)
+            self.generate_sudoku(puzzle, difficulty, is_cancelled)
 
+            if is_cancelled is not None and is_cancelled():
+                return None
+            if best is None or puzzle.count(0) > best[1].count(0):
+                best = completed, puzzle
 
-def generate_sudoku(board, n):
+            # If the correct number of entries are not removed, then redo again, unless the time is up
+            if puzzle.count(0) == difficulty or (deadline is not None and perf_counter() >= deadline):
+                return best
+
+
+"""
+The functions below solve and generate with a new solver for every call, which uses the random module
+like the rest of the game, so random.seed() still makes them repeatable. The random module is shared by
+everything in the process; threads generating at the same time should each use a Solver of their own.
+"""
+
+
+def _get_solver(backend, stats, seed=None):
+    """
+    Returns a solver for a single call, using the random module, or a generator seeded with the seed
+    :param backend: str (default: DEFAULT_SOLVER_BACKEND)
+    :param stats: SolverStats
+    :param seed: int
+    :return: Solver
+    """
+
+    return Solver(backend or DEFAULT_SOLVER_BACKEND, random if seed is None else Random(seed), stats)
+
+
+def get_puzzle_id(difficulty, seed, backend=DEFAULT_SOLVER_BACKEND):
+    """
+    Returns the ID of the puzzle generated from a seed, like "v1-backtracking-40-1234", which stays the same
+    for as long as GENERATOR_VERSION does
+    :param difficulty: int
+    :param seed: int
+    :param backend: str
+    :return: str
+    """
+
+    return f"v{GENERATOR_VERSION}-{backend}-{difficulty}-{seed}"
+
+
+def iterate_solutions(board, randomize=False, stats=None):
+    """
+    Yields the solutions of a sudoku board one at a time, as they are found, without changing the board
+    The work done is added to stats, if given
+    :param board: Board
+    :param randomize: bool
+    :param stats: SolverStats
+    :return: Iterator[Board]
+    """
+
+    return _get_solver(None, stats).iterate_solutions(board, randomize)
+
+
+def solve_sudoku(board, backend=None, stats=None):
+    """
+    Solves a sudoku board using backtracking, or exact cover if the "dlx" backend is chosen
+    The work done is added to stats, if given
+    :param board: Board
+    :param backend: str
+    :param stats: SolverStats
+    :return: bool
+    """
+
+    return _get_solver(backend, stats).solve(board)
+
+
+def count_solutions(board, limit=2, backend=None, stats=None):
+    """
+    Counts the solutions of a sudoku board, stopping as soon as limit solutions are found
+    The board is left unchanged and the work done is added to stats, if given
+    :param board: Board
+    :param limit: int
+    :param backend: str
+    :param stats: SolverStats
+    :return: int
+    """
+
+    return _get_solver(backend, stats).count_solutions(board, limit)
+
+
+def generate_sudoku(board, n, should_stop=None, backend=None, seed=None):
     """
     Procedurally removes n numbers from a solved sudoku grid to create a one-way solvable sudoku puzzle
-    :param board: List[List[int]]
+    The same numbers are removed from the same grid every time for the same seed
+    :param board: Board
     :param n: int
+    :param should_stop: Callable[[], bool]
+    :param backend: str
+    :param seed: int
     :return: None
     """
 
-    global no_of_solutions
-    free_positions = AVAILABLE_POSITIONS.copy()
+    _get_solver(backend, None, seed).generate_sudoku(board, n, should_stop)
+
+
+def generate_puzzle(difficulty, deadline=None, is_cancelled=None, backend=None, seed=None):
+    """
+    Generates a solved sudoku grid and a one-way solvable puzzle with difficulty numbers removed from it
+    The same puzzle is generated every time for the same seed, unless the deadline cuts it short
+    :param difficulty: int
+    :param deadline: float
+    :param is_cancelled: Callable[[], bool]
+    :param backend: str
+    :param seed: int
+    :return: Tuple[Board, Board]
+    """
+
+    return _get_solver(backend, None, seed).generate_puzzle(difficulty, deadline, is_cancelled)
+
+
+class GenerationJob:
+    """
+    This is a puzzle being generated in a background thread, which can be cancelled, and which gives
+    the best puzzle found so far once its time limit is up
+    """
+    def __init__(self, difficulty, time_limit=None, puzzle=None, solver=None, puzzle_id=None):
+        """
+        Starts generating a puzzle, or finishes at once with the given puzzle
+        :param difficulty: int
+        :param time_limit: float (seconds, or None to wait for a puzzle of the exact difficulty)
+        :param puzzle: Tuple[Board, Board] (puzzle that is already ready, if any)
+        :param solver: Solver (solver the thread generates with, which nothing else may use until the job is done)
+        :param puzzle_id: str (ID of the puzzle, if it has one)
+        """
+
+        self.difficulty = difficulty
+        self.time_limit = time_limit
+        self.puzzle_id = puzzle_id
+        self.solver = Solver() if solver is None else solver
+        self.start_time = perf_counter()
+        self.puzzle = puzzle
+        self._cancelled = Event()
+        self._done = Event()
+
+        if puzzle is not None:
+            self._done.set()
+        else:
+            Thread(target=self._run, name="GenerationJob", daemon=True).start()
+
+    def _run(self):
+        """
+        Generates the puzzle
+        :return: None
+        """
+
+        deadline = None if self.time_limit is None else self.start_time + self.time_limit
+        try:
+            self.puzzle = self.solver.generate_puzzle(self.difficulty, deadline, self._cancelled.is_set)
+        finally:
+            self._done.set()
 
-    while n > 0:
-        x, y = free_positions.pop(randrange(0, len(free_positions) - 1))
-        temp_number = board[x][y]
-        board[x][y] = 0
+    def is_done(self):
+        """
+        Checks if the puzzle is ready, or the job was cancelled
+        :return: bool
+        """
 
-        # create a copy of the original board to send by copy
-        temp_board = create_duplicate_board(board)
+        return self._done.is_set()
 
-        # If the number of apparent solutions is 1, then proceed to remove the number
-        no_of_solutions = 0
-        solve_sudoku(temp_board)
+    def wait(self, timeout=None):
+        """
+        Waits for the job to be done, for at most timeout seconds
+        :param timeout: float
+        :return: bool (True if the job is done)
+        """
 
-        if no_of_solutions != 1:
-            board[x][y] = temp_number
-            free_positions.append((x, y))
-        n -= 1
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """
+        Stops the generation, which drops the puzzle
+        :return: None
+        """
+
+        self._cancelled.set()
+
+    def get_progress(self):
+        """
+        Returns the share of the time limit used so far, which is 1 once the job is done
+        :return: float
+        """
+
+        if self.is_done():
+            return 1.0
+        if not self.time_limit:
+            return 0.0
+        return min(1.0, (perf_counter() - self.start_time) / self.time_limit)
+
+    def get_result(self):
+        """
+        Waits for the job to be done and returns its puzzle
+        :return: Tuple[Board, Board] (None if the job was cancelled)
+        """
+
+        self._done.wait()
+        return None if self._cancelled.is_set() else self.puzzle
 
 
 """
 This is the sudoku class that can handle input, marking, undo and redo operations.
 This can be easily integrated with pygame to provide an interactive way of solving
 the puzzle.
+
+Listeners added with add_listener are called whenever the progress changes, as
+    listener("progress", percentage)
+    listener("completed", kind, index)    e.g. ("completed", "Row", 3) once row 3 is filled correctly
+    listener("uncompleted", kind, index)  once a completed unit is changed again
+The completion events are also sent for every unit that changes when the board is cleared or a puzzle is set.
 """
 
 
 class Sudoku:
-    def __init__(self):
+    def __init__(self, pool=None, bank=None, solver=None, cache=None):
         """
         Initializes the Sudoku class
+        :param pool: PuzzlePool (pre-generated puzzles to take from, if any)
+        :param bank: PuzzleBank (puzzle bank file to load puzzles from, if any)
+        :param solver: Solver (solver puzzles are generated with, default: a new one)
+        :param cache: PuzzleCache (puzzles generated earlier, by puzzle ID, if any)
         """
 
         # Initialize attributes
+        self.pool = pool
+        self.bank = bank
+        self.solver = Solver() if solver is None else solver
+        self.cache = cache
+        self.puzzle_id = None
         self.sudoku_completed = None
         self.sudoku_puzzle = None
         self.current_sudoku_puzzle = None
@@ -147,45 +753,251 @@ class Sudoku:
         self.redo_history = []
         self.matching_numbers = None
         self.completion = {"Row": [], "Column": [], "Box": []}
+        self.no_of_entries = 0
+        self.listeners = []
+
+        # Conflict and progress tracking, kept up to date by _set_cell
+        # unit_counts[u][n] is the number of n's in unit u, wrong_counts[u][n] the number of wrong n's
+        # and correct_counts[u] the number of positions of unit u holding their solution
+        self.unit_counts = None
+        self.wrong_counts = None
+        self.correct_counts = None
+        self.correct_entries = 0
+        self.wrong_entries = set()
+        self.conflicts = set()
 
         # Initialize flags and placeholders
         self.is_marking = False
 
-    def initialize_puzzle(self, difficulty):
+    def initialize_puzzle(self, difficulty, time_limit=None, seed=None):
         """
         Initializes the puzzle, completed puzzle and states
+        The puzzle of a seed is the same every time, and is taken from the cache once it has been generated
+        :param difficulty: int
+        :param time_limit: float (seconds a puzzle is generated for at most, if none is ready)
+        :param seed: int (seed to generate the puzzle from, default: a ready puzzle or a random seed)
+        :return: None
+        """
+
+        puzzle, puzzle_id, solver = self._find_puzzle(difficulty, seed)
+        if puzzle is None:
+            deadline = None if time_limit is None else perf_counter() + time_limit
+            puzzle = solver.generate_puzzle(difficulty, deadline)
+        self.set_puzzle(difficulty, puzzle, puzzle_id)
+
+    def start_puzzle(self, difficulty, time_limit=None, seed=None):
+        """
+        Starts getting a puzzle without waiting for it to be generated, to be played with set_puzzle
+        once the job is done. The job generates with a solver of its own, spawned from the solver of the Sudoku
+        :param difficulty: int
+        :param time_limit: float (seconds a puzzle is generated for at most, if none is ready)
+        :param seed: int (seed to generate the puzzle from, default: a ready puzzle or a random seed)
+        :return: GenerationJob
+        """
+
+        puzzle, puzzle_id, solver = self._find_puzzle(difficulty, seed)
+        return GenerationJob(difficulty, time_limit, puzzle, solver, puzzle_id)
+
+    def _find_puzzle(self, difficulty, seed):
+        """
+        Finds the puzzle of the seed in the cache, or without a seed, loads a puzzle from the bank or takes a
+        ready one from the pool. If no puzzle is found, a random seed is picked and the solver to generate the
+        puzzle of the seed is returned instead
+        :param difficulty: int
+        :param seed: int
+        :return: Tuple[Tuple[Board, Board], str, Solver] (puzzle or None, puzzle ID or None, solver or None)
+        """
+
+        if seed is None:
+            puzzle = self.bank.take(difficulty) if self.bank else None
+            if puzzle is None and self.pool:
+                puzzle = self.pool.take(difficulty)
+            if puzzle is not None:
+                return puzzle, None, None
+            seed = self.solver.random.getrandbits(32)
+
+        puzzle_id = get_puzzle_id(difficulty, seed, self.solver.backend)
+        puzzle = self.cache.get(puzzle_id) if self.cache is not None else None
+        if puzzle is not None:
+            return puzzle, puzzle_id, None
+        return None, puzzle_id, self.solver.spawn(seed)
+
+    def set_puzzle(self, difficulty, puzzle, puzzle_id=None):
+        """
+        Initializes the completed puzzle, the puzzle and the states from a generated puzzle,
+        and adds it to the cache if it has an ID
         :param difficulty: int
+        :param puzzle: Tuple[Board, Board] (completed puzzle, puzzle)
+        :param puzzle_id: str (ID of the puzzle, if it has one)
         :return: None
         """
 
         self.difficulty = difficulty
         self.is_marking = False
-        self.sudoku_completed = create_empty_sudoku_board()
-        solve_sudoku(self.sudoku_completed)
-        self.sudoku_puzzle = create_duplicate_board(self.sudoku_completed)
-        generate_sudoku(self.sudoku_puzzle, self.difficulty)
-        self.current_sudoku_puzzle = create_duplicate_board(self.sudoku_puzzle)
-
-        # If the correct number of entries are not removed, then redo again
-        if sum([self.sudoku_puzzle[x].count(0) for x in range(9)]) != self.difficulty:
-            self.initialize_puzzle(self.difficulty)
+        self.sudoku_completed, self.sudoku_puzzle = puzzle
+        # A puzzle generated against a time limit can have fewer empty positions than its difficulty
+        self.no_of_entries = self.sudoku_puzzle.count(0)
 
+        # Such a puzzle is not the puzzle of its seed, so it does not get the ID of the seed
+        self.puzzle_id = puzzle_id if self.no_of_entries == difficulty else None
+        if self.puzzle_id and self.cache is not None:
+            self.cache.put(self.puzzle_id, puzzle)
+        self.current_sudoku_puzzle = create_duplicate_board(self.sudoku_puzzle)
         self.entry_prohibition = self._set_entry_prohibition()
-        self.completion["Column"] = [1 if 0 not in self.current_sudoku_puzzle[r] else 0 for r in range(9)]
-        self.completion["Row"] = [1 if 0 not in [self.current_sudoku_puzzle[r][c] for r in range(9)] else 0 for c in range(9)]
-        self.completion["Box"] = [1 if 0 not in [self.current_sudoku_puzzle[x][y] for x in range(r, r+3) for y in range(c, c+3)]
-                                  else 0 for c in range(0, 9, 3) for r in range(0, 9, 3)]
+        self._count_entries()
 
         self.markings = {(x, y): [] for x in range(9) for y in range(9) if (x, y) not in self.entry_prohibition}
         self.matching_numbers = {n: [] for n in range(1, 10)}
 
     def _set_entry_prohibition(self):
         """
-        Sets the positions (x,y) where entries can be made
-        :return: List[Tuple[int, int]]
+        Sets the positions (x,y) where entries cannot be made
+        :return: Set[Tuple[int, int]]
         """
 
-        return [(x, y) for x in range(9) for y in range(9) if self.sudoku_puzzle[x][y] != 0]
+        return {AVAILABLE_POSITIONS[i] for i, n in enumerate(self.sudoku_puzzle.cells) if n != 0}
+
+    def add_listener(self, listener):
+        """
+        Adds a listener to be called on progress and unit completion changes
+        :param listener: Callable
+        :return: None
+        """
+
+        self.listeners.append(listener)
+
+    def _notify(self, event, *details):
+        """
+        Calls every listener with an event
+        :param event: str
+        :param details: Any
+        :return: None
+        """
+
+        for listener in self.listeners:
+            listener(event, *details)
+
+    def _count_entries(self):
+        """
+        Recounts the numbers in every unit, the correct entries, the completed units
+        and the conflicting positions from scratch, and notifies the listeners of the changes
+        :return: None
+        """
+
+        cells, completed, given = self.current_sudoku_puzzle.cells, self.sudoku_completed.cells, self.sudoku_puzzle.cells
+        self.unit_counts = [[0] * 10 for _ in range(27)]
+        self.wrong_counts = [[0] * 10 for _ in range(27)]
+        self.correct_counts = [0] * 27
+        self.correct_entries = 0
+        self.wrong_entries = set()
+        for i, n in enumerate(cells):
+            if n != 0:
+                for u in UNITS_OF[i]:
+                    self.unit_counts[u][n] += 1
+                if n == completed[i]:
+                    self.correct_entries += given[i] == 0
+                    for u in UNITS_OF[i]:
+                        self.correct_counts[u] += 1
+                else:
+                    self.wrong_entries.add(i)
+                    for u in UNITS_OF[i]:
+                        self.wrong_counts[u][n] += 1
+        self.conflicts = {AVAILABLE_POSITIONS[i] for i in range(81) if self._is_conflicting(i)}
+
+        # Listeners are told about every unit whose completion changed, as if it was changed by an entry
+        events = []
+        for k, kind in enumerate(UNIT_KINDS):
+            old = self.completion[kind] or [0] * 9
+            self.completion[kind] = [1 if self.correct_counts[9 * k + j] == 9 else 0 for j in range(9)]
+            events += [("completed" if self.completion[kind][j] else "uncompleted", kind, j)
+                       for j in range(9) if self.completion[kind][j] != old[j]]
+        self._notify("progress", self.get_percentage_completion())
+        for event in events:
+            self._notify(*event)
+
+    def _is_conflicting(self, i):
+        """
+        Checks if position i holds the same number as a wrong entry in one of its units
+        :param i: int
+        :return: bool
+        """
+
+        n = self.current_sudoku_puzzle.cells[i]
+        if n == 0:
+            return False
+        # A wrong entry does not conflict with itself
+        own = i in self.wrong_entries
+        return any(self.wrong_counts[u][n] > own for u in UNITS_OF[i])
+
+    def _count_correct(self, i, change, events):
+        """
+        Adds change to the correct entry counts of position i, and updates the completion of its units
+        The completion events are added to events, to be sent once the board is updated
+        :param i: int
+        :param change: int (1 or -1)
+        :param events: List[Tuple[str, str, int]]
+        :return: None
+        """
+
+        self.correct_entries += change
+        for u in UNITS_OF[i]:
+            was_complete = self.correct_counts[u] == 9
+            self.correct_counts[u] += change
+            if was_complete != (self.correct_counts[u] == 9):
+                kind, j = UNIT_KINDS[u // 9], u % 9
+                self.completion[kind][j] = 1 - self.completion[kind][j]
+                events.append(("completed" if self.completion[kind][j] else "uncompleted", kind, j))
+
+    def _set_cell(self, x, y, n):
+        """
+        Sets position (x,y) of the current puzzle to n, updating the counts, completion and conflicts
+        Only the positions in the units of (x,y) holding the old or the new number can change conflict
+        :param x: int
+        :param y: int
+        :param n: int
+        :return: None
+        """
+
+        i = y * 9 + x
+        cells = self.current_sudoku_puzzle.cells
+        correct = self.sudoku_completed.cells[i]
+        old = cells[i]
+        if old == n:
+            return
+
+        events = []
+        if old != 0:
+            for u in UNITS_OF[i]:
+                self.unit_counts[u][old] -= 1
+            if old == correct:
+                self._count_correct(i, -1, events)
+            else:
+                self.wrong_entries.discard(i)
+                for u in UNITS_OF[i]:
+                    self.wrong_counts[u][old] -= 1
+
+        cells[i] = n
+        if n != 0:
+            for u in UNITS_OF[i]:
+                self.unit_counts[u][n] += 1
+            if n == correct:
+                self._count_correct(i, 1, events)
+            else:
+                self.wrong_entries.add(i)
+                for u in UNITS_OF[i]:
+                    self.wrong_counts[u][n] += 1
+
+        for j in (i,) + PEERS[i]:
+            if cells[j] == old or cells[j] == n:
+                if self._is_conflicting(j):
+                    self.conflicts.add(AVAILABLE_POSITIONS[j])
+                else:
+                    self.conflicts.discard(AVAILABLE_POSITIONS[j])
+
+        if correct in (old, n):
+            self._notify("progress", self.get_percentage_completion())
+        for event in events:
+            self._notify(*event)
 
     def get_percentage_completion(self):
         """
@@ -193,12 +1005,7 @@ class Sudoku:
         :return: float
         """
 
-        correct_entries = 0
-        for x in range(9):
-            for y in range(9):
-                if self.sudoku_puzzle[x][y] == 0:
-                    correct_entries += (self.sudoku_completed[x][y] == self.current_sudoku_puzzle[x][y])
-        return (correct_entries/self.difficulty)*100
+        return (self.correct_entries/self.no_of_entries)*100
 
     def _clear_all_histories(self):
         """
@@ -216,6 +1023,7 @@ class Sudoku:
         """
 
         self.current_sudoku_puzzle = create_duplicate_board(self.sudoku_puzzle)
+        self._count_entries()
         self.markings = {(x, y): [] for x in range(9) for y in range(9) if (x, y) not in self.entry_prohibition}
         self._clear_all_histories()
 
@@ -225,12 +1033,8 @@ class Sudoku:
         :return: List[Tuple]
         """
 
-        wrong_entries = []
-        for x in range(9):
-            for y in range(9):
-                if self.current_sudoku_puzzle[x][y] != 0 and self.current_sudoku_puzzle[x][y] != self.sudoku_completed[x][y]:
-                    wrong_entries.append((x, y, self.current_sudoku_puzzle[x][y]))
-        return wrong_entries
+        cells = self.current_sudoku_puzzle.cells
+        return [AVAILABLE_POSITIONS[i] + (cells[i],) for i in sorted(self.wrong_entries)]
 
     def insert(self, x, y, n):
         """
@@ -245,7 +1049,7 @@ class Sudoku:
             if self.is_marking:
                 if n not in self.markings[(x, y)]:
                     self.markings[(x, y)].append(n)
-                    self.current_sudoku_puzzle[x][y] = 0
+                    self._set_cell(x, y, 0)
                     self.undo_history.append((x, y, self.is_marking, -1))
                 else:
                     self.markings[(x, y)].remove(n)
@@ -253,7 +1057,7 @@ class Sudoku:
             else:
                 self.undo_history.append((x, y, self.is_marking, self.current_sudoku_puzzle[x][y]))
                 self.markings[(x, y)] = []
-                self.current_sudoku_puzzle[x][y] = n
+                self._set_cell(x, y, n)
 
     def remove(self, x, y):
         """
@@ -270,7 +1074,7 @@ class Sudoku:
             else:
                 if self.current_sudoku_puzzle[x][y] != 0:
                     self.undo_history.append((x, y, self.is_marking, self.current_sudoku_puzzle[x][y]))
-                    self.current_sudoku_puzzle[x][y] = 0
+                    self._set_cell(x, y, 0)
 
     def undo(self):
         """
@@ -294,7 +1098,7 @@ class Sudoku:
                     self.redo_history.append((x, y, state, -1))
             else:
                 self.redo_history.append((x, y, state, self.current_sudoku_puzzle[x][y]))
-                self.current_sudoku_puzzle[x][y] = n
+                self._set_cell(x, y, n)
 
     def redo(self):
         """
@@ -318,4 +1122,4 @@ class Sudoku:
                     self.undo_history.append((x, y, state, -1))
             else:
                 self.undo_history.append((x, y, state, self.current_sudoku_puzzle[x][y]))
-                self.current_sudoku_puzzle[x][y] = n
+                self._set_cell(x, y, n)
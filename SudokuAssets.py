@@ -0,0 +1,177 @@
+"""
+This file consists of the image assets of the game and the tool that packs them into a texture atlas.
+
+The images of Resources/ are packed at build time into a single atlas image (Atlas.png) with an
+index of where every image is (Atlas.json), so the game reads them all at once instead of one
+file at a time. The images the Intro screen needs are left out of the atlas and read on their
+own, so the first frame does not wait for the rest. The index has the size of every image, and
+whether it is opaque, so neither needs the pixels to be known.
+
+Surfaces are converted to the pixel format of the display when they are first used, opaque
+images without their alpha channel, so blitting them does not convert them every time.
+
+Example:
+    python SudokuAssets.py Resources
+"""
+
+# Imports
+import argparse
+import json
+import os
+import pygame
+
+ATLAS_IMAGE = "Atlas.png"
+ATLAS_INDEX = "Atlas.json"
+MAX_ATLAS_WIDTH = 2048
+# Images of the Intro screen, which are read on their own rather than with the atlas
+INTRO_ASSETS = ("SudokuForeverIntroPage",)
+
+
+def is_opaque(surface):
+    """
+    Checks if every pixel of the surface is fully opaque
+    :param surface: pygame.Surface
+    :return: bool
+    """
+
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return True
+    return pygame.mask.from_surface(surface, 254).count() == surface.get_width() * surface.get_height()
+
+
+def _shelf_pack(sizes, width):
+    """
+    Places images of the given sizes on shelves of an atlas of the given width, from the tallest to the shortest
+    :param sizes: Dict[str, Tuple[int, int]]
+    :param width: int
+    :return: Tuple[Dict[str, List[int]], Tuple[int, int]] (name -> [x, y, width, height], size of the atlas)
+    """
+
+    rects = {}
+    x = y = shelf_height = 0
+    for name, (image_width, image_height) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if x + image_width > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        rects[name] = [x, y, image_width, image_height]
+        x += image_width
+        shelf_height = max(shelf_height, image_height)
+    return rects, (width, y + shelf_height)
+
+
+def pack_atlas(directory):
+    """
+    Packs the images of the directory, except the Intro ones, into the atlas image and writes its index
+    :param directory: str
+    :return: int (number of images packed)
+    """
+
+    index = {}
+    images = {}
+    for file_name in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file_name)
+        if extension.lower() == ".png" and file_name != ATLAS_IMAGE:
+            image = pygame.image.load(os.path.join(directory, file_name))
+            index[name] = {"size": list(image.get_size()), "opaque": is_opaque(image)}
+            if name not in INTRO_ASSETS:
+                images[name] = image
+
+    # The atlas is made as narrow as it can be while wasting the least space
+    sizes = {name: image.get_size() for name, image in images.items()}
+    widths = range(max(width for width, height in sizes.values()), MAX_ATLAS_WIDTH + 1)
+    rects, size = min((_shelf_pack(sizes, width) for width in widths),
+                      key=lambda packing: packing[1][0] * packing[1][1])
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    for name, image in images.items():
+        index[name]["rect"] = rects[name]
+        atlas.blit(image, rects[name][:2], special_flags=pygame.BLEND_RGBA_MAX)
+
+    pygame.image.save(atlas, os.path.join(directory, ATLAS_IMAGE))
+    with open(os.path.join(directory, ATLAS_INDEX), "w") as file:
+        json.dump(index, file, sort_keys=True)
+    return len(images)
+
+
+class Assets:
+    """
+    This is the set of images of the game, loaded and converted when they are first used
+    """
+    def __init__(self, directory):
+        """
+        Reads the atlas index of the directory, if the atlas has been built
+        :param directory: str
+        """
+
+        self.directory = directory
+        self.surfaces = {}
+        self.atlas = None
+        try:
+            with open(os.path.join(directory, ATLAS_INDEX)) as file:
+                self.index = json.load(file)
+        except FileNotFoundError:
+            self.index = {}
+
+    def get(self, name):
+        """
+        Returns the image with the given name, converted to the display format
+        The display mode must be set before the first call
+        :param name: str
+        :return: pygame.Surface
+        """
+
+        surface = self.surfaces.get(name)
+        if surface is None:
+            entry = self.index.get(name)
+            if entry is not None and "rect" in entry:
+                if self.atlas is None:
+                    self.atlas = pygame.image.load(os.path.join(self.directory, ATLAS_IMAGE)).convert_alpha()
+                surface = self.atlas.subsurface(entry["rect"])
+                opaque = entry["opaque"]
+            else:
+                surface = pygame.image.load(os.path.join(self.directory, name + ".png"))
+                opaque = entry["opaque"] if entry is not None else is_opaque(surface)
+            self.surfaces[name] = surface = surface.convert() if opaque else surface.convert_alpha()
+        return surface
+
+    def get_size(self, name):
+        """
+        Returns the size of the image with the given name, without loading it if it is in the index
+        :param name: str
+        :return: Tuple[int, int]
+        """
+
+        if name in self.index:
+            return tuple(self.index[name]["size"])
+        return self.get(name).get_size()
+
+    def load_all(self):
+        """
+        Loads every image of the index ahead of their first use
+        :return: None
+        """
+
+        for name in self.index:
+            self.get(name)
+        # Every image has its own copy of its pixels, so the atlas is not kept
+        self.atlas = None
+
+
+def main(arguments=None):
+    """
+    Builds the atlas of a directory of images
+    :param arguments: List[str]
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Pack the game images into a texture atlas.")
+    parser.add_argument("directory", nargs="?", default="Resources",
+                        help="directory of the images (default: Resources)")
+    arguments = parser.parse_args(arguments)
+
+    count = pack_atlas(arguments.directory)
+    print(f"Packed {count} images into {os.path.join(arguments.directory, ATLAS_IMAGE)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+This file consists of the puzzle bank, a compact binary file of pre-generated puzzles
+that is read through mmap, so picking a puzzle only touches the record that is picked.
+
+File layout (little-endian):
+    header  - magic b"SDKB", version (H), record size (H), index entries (I), records (I)
+    index   - one entry per (difficulty, clue count): difficulty (B), clues (B), 2 pad bytes,
+              first record (I), number of records (I)
+    records - fixed-size records sorted by index entry, each holding the puzzle and its solution
+              as 81 digits packed two per byte (4 bits each, row by row, 0 for empty positions)
+
+A bank is built from the output of SudokuGenerate.py:
+    python SudokuBank.py build expert.txt puzzles.bank
+    python SudokuBank.py info puzzles.bank
+"""
+
+# Imports
+import argparse
+import mmap
+import shutil
+import struct
+import tempfile
+from random import randrange
+from Sudoku import Board
+
+MAGIC = b"SDKB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+INDEX_ENTRY = struct.Struct("<BBxxII")
+PACKED_BOARD_SIZE = 41
+RECORD_SIZE = 2 * PACKED_BOARD_SIZE
+
+
+def pack_board_string(text):
+    """
+    Packs a board written as 81 characters into 41 bytes, two digits per byte
+    :param text: str
+    :return: bytes
+    """
+
+    digits = [int(character) if character in "123456789" else 0 for character in text] + [0]
+    return bytes(digits[i] << 4 | digits[i + 1] for i in range(0, 82, 2))
+
+
+def unpack_board(data):
+    """
+    Unpacks 41 bytes of packed digits into a board
+    :param data: bytes
+    :return: Board
+    """
+
+    return Board(data[i >> 1] >> 4 if i % 2 == 0 else data[i >> 1] & 15 for i in range(81))
+
+
+def build_bank(path, lines):
+    """
+    Writes a puzzle bank from lines of "difficulty puzzle solution", as written by SudokuGenerate.py
+    Records are staged in a temporary file per index entry, so the lines are never all kept in memory
+    :param path: str
+    :param lines: Iterable[str]
+    :return: int (number of records written)
+    """
+
+    groups = {}
+    try:
+        for line in lines:
+            if not line.strip():
+                continue
+            difficulty, puzzle, solution = line.split()
+            key = (int(difficulty), sum(character in "123456789" for character in puzzle))
+            if key not in groups:
+                groups[key] = tempfile.TemporaryFile()
+            groups[key].write(pack_board_string(puzzle) + pack_board_string(solution))
+
+        keys = sorted(groups)
+        counts = [groups[key].tell() // RECORD_SIZE for key in keys]
+        with open(path, "wb") as bank:
+            bank.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, len(keys), sum(counts)))
+            first = 0
+            for (difficulty, clues), count in zip(keys, counts):
+                bank.write(INDEX_ENTRY.pack(difficulty, clues, first, count))
+                first += count
+            for key in keys:
+                groups[key].seek(0)
+                shutil.copyfileobj(groups[key], bank)
+    finally:
+        for staged in groups.values():
+            staged.close()
+
+    return sum(counts)
+
+
+class PuzzleBank:
+    """
+    This is a read-only view of a puzzle bank file
+    """
+    def __init__(self, path):
+        """
+        Maps the bank file into memory and reads its index
+        :param path: str
+        """
+
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, index_count, self.record_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} puzzle bank")
+
+        # Maps (difficulty, clues) to the first record and the number of records
+        self.index = {}
+        for i in range(index_count):
+            difficulty, clues, first, count = INDEX_ENTRY.unpack_from(self._map, HEADER.size + i * INDEX_ENTRY.size)
+            self.index[(difficulty, clues)] = (first, count)
+        self._records_offset = HEADER.size + index_count * INDEX_ENTRY.size
+
+    def __len__(self):
+        return self.record_count
+
+    def count(self, difficulty, clues=None):
+        """
+        Returns the number of puzzles of a difficulty (and clue count, if given)
+        :param difficulty: int
+        :param clues: int
+        :return: int
+        """
+
+        return sum(count for (d, c), (_, count) in self.index.items() if d == difficulty and clues in (None, c))
+
+    def get(self, i):
+        """
+        Reads the i-th record of the bank
+        :param i: int
+        :return: Tuple[Board, Board] (completed, puzzle)
+        """
+
+        offset = self._records_offset + i * RECORD_SIZE
+        record = self._map[offset:offset + RECORD_SIZE]
+        return unpack_board(record[PACKED_BOARD_SIZE:]), unpack_board(record[:PACKED_BOARD_SIZE])
+
+    def take(self, difficulty, clues=None):
+        """
+        Picks a random puzzle of a difficulty (and clue count, if given)
+        :param difficulty: int
+        :param clues: int
+        :return: Tuple[Board, Board] (None if the bank has no such puzzle)
+        """
+
+        total = self.count(difficulty, clues)
+        if total == 0:
+            return None
+
+        k = randrange(total)
+        for (d, c), (first, count) in self.index.items():
+            if d == difficulty and clues in (None, c):
+                if k < count:
+                    return self.get(first + k)
+                k -= count
+        return None
+
+    def close(self):
+        """
+        Unmaps and closes the bank file
+        :return: None
+        """
+
+        self._map.close()
+        self._file.close()
+
+
+def main(arguments=None):
+    """
+    Builds a puzzle bank or prints the index of one
+    :param arguments: List[str]
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Build or inspect a sudoku puzzle bank.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a bank from SudokuGenerate.py output")
+    build.add_argument("puzzles", nargs="+", help="files of generated puzzles")
+    build.add_argument("bank", help="bank file to write")
+    info = commands.add_parser("info", help="print the index of a bank")
+    info.add_argument("bank", help="bank file to read")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == "build":
+        def read_lines():
+            for name in arguments.puzzles:
+                with open(name) as puzzles:
+                    yield from puzzles
+        print(f"Wrote {build_bank(arguments.bank, read_lines())} puzzles to {arguments.bank}")
+    else:
+        bank = PuzzleBank(arguments.bank)
+        print(f"{len(bank)} puzzles")
+        for (difficulty, clues), (first, count) in sorted(bank.index.items()):
+            print(f"  difficulty {difficulty:>2}, {clues:>2} clues: {count} puzzles from record {first}")
+        bank.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+This file consists of NumPy versions of the board checks, which grade a whole batch of
+boards at once instead of looping over one board at a time.
+
+A batch is an (N, 9, 9) array of digits (0 for empty positions), row by row, so batch[k, y, x]
+is board[x][y] of the k-th board. Boxes are numbered row by row as well, like BOX_OF in Sudoku.py.
+"""
+
+# Imports
+from collections import namedtuple
+import numpy as np
+
+# Number of set bits of every 10-bit mask, to count the distinct numbers in a unit
+NO_OF_BITS = np.array([bin(mask).count("1") for mask in range(1 << 10)], dtype=np.uint8)
+
+BatchGrades = namedtuple("BatchGrades", ["full", "wrong_entries", "completion",
+                                         "row_violations", "column_violations", "box_violations"])
+BatchGrades.__doc__ = """
+This is the result of grading a batch of N boards
+full              - (N,) bool, every position is filled
+wrong_entries     - (N, 9, 9) bool, the position is filled with something other than the solution
+completion        - (N,) float, percentage of the empty positions of the puzzle filled correctly
+row_violations    - (N, 9) bool, the row holds a number more than once
+column_violations - (N, 9) bool, the column holds a number more than once
+box_violations    - (N, 9) bool, the box holds a number more than once
+"""
+
+
+def boards_to_array(boards):
+    """
+    Stacks Board objects into an (N, 9, 9) array
+    :param boards: Iterable[Board]
+    :return: np.ndarray
+    """
+
+    return np.frombuffer(b"".join(bytes(board.cells) for board in boards), dtype=np.uint8).reshape(-1, 9, 9)
+
+
+def strings_to_array(lines):
+    """
+    Reads boards written as lines of 81 characters ("." or "0" for empty positions) into an (N, 9, 9) array
+    :param lines: Iterable[str]
+    :return: np.ndarray
+    """
+
+    text = "".join(line.strip() for line in lines).replace(".", "0").encode("ascii")
+    if len(text) % 81:
+        raise ValueError("Every board must be written with exactly 81 characters")
+    return (np.frombuffer(text, dtype=np.uint8) - ord("0")).reshape(-1, 9, 9)
+
+
+def _find_duplicates(units):
+    """
+    Finds the units that hold a number more than once
+    :param units: np.ndarray (..., 9) of the numbers in every unit
+    :return: np.ndarray (...) bool
+    """
+
+    # A unit has a duplicate when it has fewer distinct numbers than filled positions
+    bits = np.left_shift(1, units.astype(np.uint16)) & ~np.uint16(1)
+    distinct = NO_OF_BITS[np.bitwise_or.reduce(bits, axis=-1)]
+    return distinct < np.count_nonzero(units, axis=-1)
+
+
+def grade_boards(boards, solutions, puzzles=None):
+    """
+    Grades a batch of boards against their solutions
+    The completion is measured over the empty positions of the puzzles if they are given,
+    and over all 81 positions otherwise
+    :param boards: np.ndarray (N, 9, 9)
+    :param solutions: np.ndarray (N, 9, 9)
+    :param puzzles: np.ndarray (N, 9, 9)
+    :return: BatchGrades
+    """
+
+    boards = np.asarray(boards, dtype=np.uint8)
+    solutions = np.asarray(solutions, dtype=np.uint8)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError(f"Expected an (N, 9, 9) array of boards, got shape {boards.shape}")
+    if solutions.shape != boards.shape:
+        raise ValueError(f"Expected solutions of shape {boards.shape}, got {solutions.shape}")
+
+    filled = boards != 0
+    full = filled.all(axis=(1, 2))
+    wrong_entries = filled & (boards != solutions)
+
+    if puzzles is None:
+        open_positions = np.ones(boards.shape, dtype=bool)
+    else:
+        open_positions = np.asarray(puzzles) == 0
+    correct_entries = np.count_nonzero(open_positions & (boards == solutions), axis=(1, 2))
+    no_of_open_positions = np.count_nonzero(open_positions, axis=(1, 2))
+    completion = np.divide(correct_entries * 100.0, no_of_open_positions,
+                           out=np.full(len(boards), 100.0), where=no_of_open_positions > 0)
+
+    # Regroup the positions into boxes: (N, box row, row in box, box column, column in box) -> (N, box, 9)
+    boxes = boards.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+
+    return BatchGrades(full=full,
+                       wrong_entries=wrong_entries,
+                       completion=completion,
+                       row_violations=_find_duplicates(boards),
+                       column_violations=_find_duplicates(boards.transpose(0, 2, 1)),
+                       box_violations=_find_duplicates(boxes))
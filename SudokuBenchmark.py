@@ -0,0 +1,320 @@
+"""
+This file consists of the benchmark suite of the sudoku engine. It times
+    - solve_sudoku on a fixed corpus of puzzles, from easy ones to the hardest known ones, with every backend
+    - generate_sudoku and Sudoku.initialize_puzzle at every difficulty, and initialize_puzzle from the puzzle cache
+    - the Sudoku move APIs (insert, remove, undo, redo) over a long random sequence of moves
+Every workload is made from fixed seeds, so two runs time the same work. The solver's node counts are
+recorded as well, since they do not depend on the machine, and so are the IDs of the generated puzzles.
+
+The results are written as JSON, and can be compared with the results of an earlier run: a benchmark
+whose median time grew by more than the threshold is reported as a regression, and the exit status is 1.
+
+Example:
+    python SudokuBenchmark.py -o before.json
+    python SudokuBenchmark.py -o after.json --baseline before.json --threshold 1.25
+"""
+
+# Imports
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from Sudoku import (Difficulty, SOLVER_BACKENDS, Solver, Sudoku, board_from_string, create_duplicate_board,
+                    create_empty_sudoku_board)
+from SudokuCache import PuzzleCache
+from SudokuStats import percentile
+
+RESULTS_VERSION = 1
+
+# Puzzles to solve, from the easiest to the hardest. The first four were generated with seeds 1 to 4
+CORPUS = [("easy", ".392.1748458367219172948.369135.46825276831..86419235.79142586.24583697.3.6719425"),
+          ("medium", ".9...7..3.2..691.4.8613.2798.29.1.373672.5941.143768522.5613498.497583266384927.5"),
+          ("hard", ".1.87.35667312.849.894.62..36295...14...8.63...13.792....61259.12..93.7.93..48162"),
+          ("expert", "2.3.......7.2.4619....7....1453..968...8..2..98..1637.8..46.5.77.915843.3..7.218."),
+          ("project-euler-1", "003020600900305001001806400008102900700000008006708200002609500800203009005010300"),
+          ("anti-backtracking", "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9"),
+          ("norvig-hard", "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"),
+          ("top95-2", "52...6.........7.13...........4..8..6......5...........418.........3..2...87....."),
+          ("ai-escargot", "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."),
+          ("inkala-2012", "800000000003600000070090200050007000000045700000100030001000068008500010090000400")]
+
+DIFFICULTIES = {"easy": Difficulty.Easy,
+                "medium": Difficulty.Medium,
+                "hard": Difficulty.Hard,
+                "expert": Difficulty.Expert}
+
+MOVES = ("insert", "remove", "undo", "redo", "toggle_marking")
+MOVE_WEIGHTS = (10, 3, 3, 2, 1)
+
+
+def summarize(seconds, **details):
+    """
+    Summarizes the timings of a benchmark in milliseconds
+    :param seconds: List[float]
+    :param details: Any (more values to keep with the timings)
+    :return: Dict[str, Any]
+    """
+
+    return {"runs": len(seconds),
+            "median_ms": percentile(seconds, 50) * 1000,
+            "p90_ms": percentile(seconds, 90) * 1000,
+            "min_ms": min(seconds) * 1000,
+            "max_ms": max(seconds) * 1000,
+            **details}
+
+
+def benchmark_solve(text, backend, repeat, seed):
+    """
+    Times solving a puzzle of the corpus
+    :param text: str
+    :param backend: str
+    :param repeat: int
+    :param seed: int
+    :return: Dict[str, Any]
+    """
+
+    seconds = []
+    for _ in range(repeat):
+        board = board_from_string(text)
+        solver = Solver(backend, random.Random(seed))
+        start = time.perf_counter()
+        solved = solver.solve(board)
+        seconds.append(time.perf_counter() - start)
+        if not solved:
+            raise RuntimeError(f"The {backend} backend did not solve {text}")
+    return summarize(seconds, nodes=solver.stats.nodes)
+
+
+def benchmark_generate(difficulty, repeat, seed):
+    """
+    Times removing numbers from solved grids with generate_sudoku, a different grid for every run
+    :param difficulty: int
+    :param repeat: int
+    :param seed: int
+    :return: Dict[str, Any]
+    """
+
+    seconds = []
+    for run in range(repeat):
+        solver = Solver(rng=random.Random(seed + run))
+        puzzle = create_empty_sudoku_board()
+        solver.solve(puzzle)
+        puzzle = create_duplicate_board(puzzle)
+        start = time.perf_counter()
+        solver.generate_sudoku(puzzle, difficulty)
+        seconds.append(time.perf_counter() - start)
+    return summarize(seconds)
+
+
+def benchmark_initialize(difficulty, repeat, seed):
+    """
+    Times Sudoku.initialize_puzzle without a pool, a bank or a cache, so every puzzle is generated on the spot
+    :param difficulty: int
+    :param repeat: int
+    :param seed: int
+    :return: Dict[str, Any]
+    """
+
+    seconds = []
+    puzzle_ids = []
+    for run in range(repeat):
+        sudoku = Sudoku()
+        start = time.perf_counter()
+        sudoku.initialize_puzzle(difficulty, seed=seed + run)
+        seconds.append(time.perf_counter() - start)
+        puzzle_ids.append(sudoku.puzzle_id)
+    return summarize(seconds, puzzle_ids=puzzle_ids)
+
+
+def benchmark_cached_initialize(difficulty, repeat, seed):
+    """
+    Times Sudoku.initialize_puzzle taking the puzzles of the seeds from a puzzle cache they were put in before
+    :param difficulty: int
+    :param repeat: int
+    :param seed: int
+    :return: Dict[str, Any]
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "puzzles.txt")
+        sudoku = Sudoku(cache=PuzzleCache(path))
+        for run in range(repeat):
+            sudoku.initialize_puzzle(difficulty, seed=seed + run)
+
+        # The cache is read from its file, like it is when the game starts
+        sudoku = Sudoku(cache=PuzzleCache(path))
+        seconds = []
+        for run in range(repeat):
+            start = time.perf_counter()
+            sudoku.initialize_puzzle(difficulty, seed=seed + run)
+            seconds.append(time.perf_counter() - start)
+    return summarize(seconds)
+
+
+def benchmark_moves(count, seed):
+    """
+    Times the move APIs of a Sudoku over a random sequence of moves on an expert puzzle
+    :param count: int
+    :param seed: int
+    :return: Dict[str, Dict[str, Any]] (move -> summary)
+    """
+
+    sudoku = Sudoku()
+    sudoku.initialize_puzzle(Difficulty.Expert, seed=seed)
+    open_positions = [(x, y) for y in range(9) for x in range(9) if (x, y) not in sudoku.entry_prohibition]
+
+    # The moves are picked up front, so the random number generator is not timed
+    moves_rng = random.Random(seed)
+    moves = [(move, *moves_rng.choice(open_positions), moves_rng.randint(1, 9))
+             for move in moves_rng.choices(MOVES, MOVE_WEIGHTS, k=count)]
+
+    seconds = {move: [] for move in MOVES}
+    for move, x, y, n in moves:
+        start = time.perf_counter()
+        if move == "insert":
+            sudoku.insert(x, y, n)
+        elif move == "remove":
+            sudoku.remove(x, y)
+        elif move == "undo":
+            sudoku.undo()
+        elif move == "redo":
+            sudoku.redo()
+        else:
+            sudoku.is_marking = not sudoku.is_marking
+        seconds[move].append(time.perf_counter() - start)
+    return {move: summarize(times) for move, times in seconds.items() if move != "toggle_marking"}
+
+
+def run_benchmarks(repeat, moves, seed, log=None):
+    """
+    Runs every benchmark and returns their results, by name
+    :param repeat: int
+    :param moves: int
+    :param seed: int
+    :param log: Callable[[str, Dict[str, Any]], None] (called with every result as it comes)
+    :return: Dict[str, Dict[str, Any]]
+    """
+
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        if log:
+            log(name, result)
+
+    for backend in SOLVER_BACKENDS:
+        for name, text in CORPUS:
+            record(f"solve/{backend}/{name}", benchmark_solve(text, backend, repeat, seed))
+    for name, difficulty in DIFFICULTIES.items():
+        record(f"generate_sudoku/{name}", benchmark_generate(difficulty, repeat, seed))
+    for name, difficulty in DIFFICULTIES.items():
+        record(f"initialize_puzzle/{name}", benchmark_initialize(difficulty, repeat, seed))
+    record("initialize_puzzle/cached/expert", benchmark_cached_initialize(Difficulty.Expert, repeat, seed))
+    for move, result in benchmark_moves(moves, seed).items():
+        record(f"moves/{move}", result)
+    return results
+
+
+def find_regressions(results, baseline, threshold, min_delta_ms):
+    """
+    Finds the benchmarks that got slower than the baseline by more than the threshold: the median time grew
+    by more than the threshold and by more than min_delta_ms, or the solver visited more nodes by more than
+    the threshold
+    :param results: Dict[str, Dict[str, Any]]
+    :param baseline: Dict[str, Dict[str, Any]]
+    :param threshold: float (largest ratio that is not a regression)
+    :param min_delta_ms: float (smallest growth of the median that can be a regression, to ignore timer noise)
+    :return: List[Tuple[str, str, float]] (name, "median_ms" or "nodes", ratio)
+    """
+
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["median_ms"] > before["median_ms"] * threshold and \
+                result["median_ms"] - before["median_ms"] > min_delta_ms:
+            regressions.append((name, "median_ms", result["median_ms"] / before["median_ms"]))
+        if "nodes" in result and "nodes" in before and result["nodes"] > before["nodes"] * threshold:
+            regressions.append((name, "nodes", result["nodes"] / before["nodes"]))
+    return regressions
+
+
+def parse_arguments(arguments=None):
+    """
+    Parses the command line arguments
+    :param arguments: List[str]
+    :return: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark sudoku solving, generation and moves.")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to write the results to, as JSON (default: standard output)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="number of runs of every solve and generation benchmark (default: 5)")
+    parser.add_argument("-m", "--moves", type=int, default=20000,
+                        help="number of random moves for the move benchmarks (default: 20000)")
+    parser.add_argument("-s", "--seed", type=int, default=0,
+                        help="seed the workloads are made from (default: 0)")
+    parser.add_argument("-b", "--baseline",
+                        help="results of an earlier run to compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=1.25,
+                        help="slowdown of the median time or node count that is a regression (default: 1.25)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="smallest growth of the median time, in milliseconds, that is a regression "
+                             "(default: 0.01)")
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    """
+    Runs the benchmarks, writes their results and compares them with the baseline
+    :param arguments: List[str]
+    :return: int (1 if there are regressions, 0 otherwise)
+    """
+
+    arguments = parse_arguments(arguments)
+
+    def log(name, result):
+        nodes = f", {result['nodes']} nodes" if "nodes" in result else ""
+        print(f"{name:<36} median {result['median_ms']:8.3f} ms, p90 {result['p90_ms']:8.3f} ms "
+              f"({result['runs']} runs{nodes})", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = run_benchmarks(arguments.repeat, arguments.moves, arguments.seed, log)
+    print(f"Ran {len(results)} benchmarks in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    report = {"version": RESULTS_VERSION,
+              "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+              "python": platform.python_version(),
+              "platform": platform.platform(),
+              "seed": arguments.seed,
+              "repeat": arguments.repeat,
+              "moves": arguments.moves,
+              "results": results}
+    output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+    try:
+        json.dump(report, output, indent=2)
+        output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(results, baseline, arguments.threshold, arguments.min_delta)
+        for name, measure, ratio in regressions:
+            print(f"REGRESSION {name}: {measure} {ratio:.2f}x the baseline", file=sys.stderr)
+        print(f"{len(regressions)} of {len(results)} benchmarks regressed by more than {arguments.threshold:.2f}x",
+              file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
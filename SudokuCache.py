@@ -0,0 +1,73 @@
+"""
+This file consists of the local cache of generated puzzles, so a puzzle that was generated once for
+a puzzle ID (see Sudoku.get_puzzle_id) is read back instead of being generated again.
+
+The cache is a text file in the user's cache directory, with one puzzle per line: its ID, the puzzle
+and its solution, separated by spaces, with the boards written as 81 characters ("." for empty
+positions). New puzzles are appended to it as they are generated. Deleting it only means the puzzles
+are generated again.
+"""
+
+# Imports
+import os
+from Sudoku import board_from_string, board_to_string
+from SudokuPaths import get_cache_directory
+
+
+class PuzzleCache:
+    """
+    This is the set of puzzles generated earlier, by puzzle ID, kept in a file
+    """
+    def __init__(self, path=None):
+        """
+        Reads the puzzles of the cache file
+        :param path: str (default: puzzles.txt in get_cache_directory())
+        """
+
+        self.path = os.path.join(get_cache_directory(), "puzzles.txt") if path is None else path
+        # Puzzle and solution of every ID, as written in the file
+        self.puzzles = {}
+        try:
+            with open(self.path) as file:
+                for line in file:
+                    fields = line.split()
+                    # Lines that were cut short when they were written are skipped
+                    if len(fields) == 3 and len(fields[1]) == len(fields[2]) == 81:
+                        self.puzzles[fields[0]] = fields[1], fields[2]
+        except OSError:
+            pass
+
+    def __len__(self):
+        return len(self.puzzles)
+
+    def get(self, puzzle_id):
+        """
+        Returns the puzzle with the given ID
+        :param puzzle_id: str
+        :return: Tuple[Board, Board] (completed puzzle, puzzle, or None if it is not cached)
+        """
+
+        if puzzle_id not in self.puzzles:
+            return None
+        puzzle, solution = self.puzzles[puzzle_id]
+        return board_from_string(solution), board_from_string(puzzle)
+
+    def put(self, puzzle_id, puzzle):
+        """
+        Adds a puzzle to the cache, unless it already has one with the ID
+        The puzzle is kept in memory if the file cannot be written
+        :param puzzle_id: str
+        :param puzzle: Tuple[Board, Board] (completed puzzle, puzzle)
+        :return: None
+        """
+
+        if puzzle_id in self.puzzles:
+            return
+        completed, puzzle = puzzle
+        self.puzzles[puzzle_id] = board_to_string(puzzle), board_to_string(completed)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a") as file:
+                file.write(f"{puzzle_id} {' '.join(self.puzzles[puzzle_id])}\n")
+        except OSError:
+            pass
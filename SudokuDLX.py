@@ -0,0 +1,251 @@
+"""
+This file consists of an exact cover solver for sudoku, using Knuth's Algorithm X
+with Dancing Links. It works on the same flat boards as the backtracking solver.
+"""
+
+# Imports
+import random
+
+# Every sudoku placement satisfies one constraint of each of these four kinds
+CELL_CONSTRAINTS = 0
+ROW_CONSTRAINTS = 81
+COLUMN_CONSTRAINTS = 162
+BOX_CONSTRAINTS = 243
+NO_OF_CONSTRAINTS = 324
+
+
+def get_constraints(i, n):
+    """
+    Returns the four constraints that are satisfied by placing n at position i of the cells
+    :param i: int
+    :param n: int
+    :return: Tuple[int, int, int, int]
+    """
+
+    return (CELL_CONSTRAINTS + i,
+            ROW_CONSTRAINTS + i // 9 * 9 + n - 1,
+            COLUMN_CONSTRAINTS + i % 9 * 9 + n - 1,
+            BOX_CONSTRAINTS + (i // 27 * 3 + i % 9 // 3) * 9 + n - 1)
+
+
+class DancingLinks:
+    """
+    This is the exact cover matrix of a sudoku board. Nodes are stored in parallel lists
+    of links, node 0 is the root and every column has a header node.
+    """
+    def __init__(self, board, randomize=False, rng=None):
+        """
+        Builds the exact cover matrix of the empty positions of the board
+        :param board: Board
+        :param randomize: bool
+        :param rng: random.Random (generator the placements are shuffled with, default: the random module)
+        """
+
+        self.board = board
+        self.is_valid = True
+        self.solution = None
+        self.nodes = 0
+        self._partial_solution = []
+
+        # The root node
+        self.left = [0]
+        self.right = [0]
+        self.up = [0]
+        self.down = [0]
+        self.column = [0]
+        self.size = [0]
+        self.placement = [None]
+
+        # Constraints already satisfied by the numbers on the board are left out of the matrix
+        satisfied = set()
+        for i, n in enumerate(board.cells):
+            if n != 0:
+                constraints = get_constraints(i, n)
+                if satisfied.intersection(constraints):
+                    self.is_valid = False
+                satisfied.update(constraints)
+
+        headers = {}
+        for constraint in range(NO_OF_CONSTRAINTS):
+            if constraint not in satisfied:
+                headers[constraint] = self._add_column()
+
+        placements = [(i, n) for i in range(81) if board.cells[i] == 0 for n in range(1, 10)
+                      if satisfied.isdisjoint(get_constraints(i, n))]
+        # Bring randomness to the order in which placements are tried
+        if randomize:
+            (rng or random).shuffle(placements)
+
+        for i, n in placements:
+            self._add_row((i, n), [headers[constraint] for constraint in get_constraints(i, n)])
+
+    def _add_column(self):
+        """
+        Appends a column header to the end of the root's list
+        :return: int
+        """
+
+        c = len(self.left)
+        self.left.append(self.left[0])
+        self.right.append(0)
+        self.right[self.left[0]] = c
+        self.left[0] = c
+        self.up.append(c)
+        self.down.append(c)
+        self.column.append(c)
+        self.size.append(0)
+        self.placement.append(None)
+        return c
+
+    def _add_row(self, placement, columns):
+        """
+        Appends a row with a node in each of the given columns
+        :param placement: Tuple[int, int]
+        :param columns: List[int]
+        :return: None
+        """
+
+        first = None
+        for c in columns:
+            i = len(self.left)
+            self.column.append(c)
+            self.size.append(0)
+            self.placement.append(placement)
+
+            # Link the node at the bottom of its column
+            self.up.append(self.up[c])
+            self.down.append(c)
+            self.down[self.up[c]] = i
+            self.up[c] = i
+            self.size[c] += 1
+
+            # Link the node at the end of its row
+            if first is None:
+                first = i
+                self.left.append(i)
+                self.right.append(i)
+            else:
+                self.left.append(self.left[first])
+                self.right.append(first)
+                self.right[self.left[first]] = i
+                self.left[first] = i
+
+    def _cover(self, c):
+        """
+        Removes column c and every row that has a node in it from the matrix
+        :param c: int
+        :return: None
+        """
+
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, c):
+        """
+        Puts back column c and its rows, in the reverse order of _cover
+        :param c: int
+        :return: None
+        """
+
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def _search(self, limit):
+        """
+        Searches for exact covers of the remaining matrix, giving up as soon as limit covers are found
+        :param limit: int
+        :return: int
+        """
+
+        right, left, down, column, size = self.right, self.left, self.down, self.column, self.size
+
+        # Every constraint is satisfied
+        if right[0] == 0:
+            if self.solution is None:
+                self.solution = list(self._partial_solution)
+            return 1
+
+        # Branch on the column with the fewest rows
+        c = right[0]
+        j = right[c]
+        while j != 0 and size[c] > 1:
+            if size[j] < size[c]:
+                c = j
+            j = right[j]
+        if size[c] == 0:
+            return 0
+
+        count = 0
+        self._cover(c)
+        r = down[c]
+        while r != c:
+            self.nodes += 1
+            self._partial_solution.append(self.placement[r])
+            j = right[r]
+            while j != r:
+                self._cover(column[j])
+                j = right[j]
+
+            count += self._search(limit - count)
+
+            j = left[r]
+            while j != r:
+                self._uncover(column[j])
+                j = left[j]
+            self._partial_solution.pop()
+
+            if count >= limit:
+                break
+            r = down[r]
+        self._uncover(c)
+
+        return count
+
+    def count_solutions(self, limit=2):
+        """
+        Counts the solutions of the board, stopping as soon as limit solutions are found
+        :param limit: int
+        :return: int
+        """
+
+        self.solution = None
+        # _search only checks the limit once it has found a solution
+        if not self.is_valid or limit <= 0:
+            return 0
+        return self._search(limit)
+
+    def solve(self):
+        """
+        Fills the board with its first solution found
+        :return: bool
+        """
+
+        if not self.count_solutions(1):
+            return False
+
+        for i, n in self.solution:
+            self.board.cells[i] = n
+        return True
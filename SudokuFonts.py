@@ -0,0 +1,142 @@
+"""
+This file consists of the font manager, which finds the font file for every font the game asks for
+once and remembers it in a cache file, so later starts do not search the system fonts again.
+
+Fonts bundled in Resources/ are used before the system fonts. A bundled font file is named after
+the font and its style, like Calibri.ttf, Calibri-Bold.ttf, Calibri-Italic.ttf or
+Calibri-BoldItalic.ttf. A style without its own file is emulated from the regular file.
+Fonts that are found nowhere fall back to the default pygame font, like pygame.font.SysFont does.
+
+The cache is kept in the user's cache directory. Deleting it makes the next start search the
+system fonts again, which picks up fonts installed since.
+"""
+
+# Imports
+import json
+import os
+import pygame
+from SudokuPaths import get_cache_directory
+
+CACHE_VERSION = 1
+FONT_EXTENSIONS = (".ttf", ".otf")
+
+
+def get_cache_path():
+    """
+    Returns the path of the font cache file in the user's cache directory
+    :return: str
+    """
+
+    return os.path.join(get_cache_directory(), "fonts.json")
+
+
+def simplify_name(name):
+    """
+    Returns the lowercase letters and digits of a font name, the way pygame matches font names
+    :param name: str
+    :return: str
+    """
+
+    return "".join(character.lower() for character in name if character.isalnum())
+
+
+class FontManager:
+    """
+    This is the set of fonts of the game, with the font files they are loaded from resolved once
+    """
+    def __init__(self, directory, cache_path=None):
+        """
+        Finds the fonts bundled in the directory and reads the cache of resolved system fonts
+        :param directory: str
+        :param cache_path: str (default: get_cache_path())
+        """
+
+        self.directory = directory
+        self.cache_path = get_cache_path() if cache_path is None else cache_path
+        self.fonts = {}
+
+        # Bundled fonts, by their simplified file name
+        self.bundled = {}
+        for file_name in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(file_name)
+            if extension.lower() in FONT_EXTENSIONS:
+                self.bundled[simplify_name(name)] = os.path.join(directory, file_name)
+
+        # System fonts resolved by earlier starts, by simplified name and style
+        self.paths = {}
+        try:
+            with open(self.cache_path) as file:
+                cache = json.load(file)
+            if cache.get("version") == CACHE_VERSION:
+                self.paths = cache["paths"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        # Statistics
+        self.system_lookups = 0
+
+    def resolve(self, name, bold=False, italic=False):
+        """
+        Finds the font file for a font and style, and whether the style has to be emulated
+        :param name: str
+        :param bold: bool
+        :param italic: bool
+        :return: Tuple[Optional[str], bool, bool] (font file or None for the default font, emulate bold, emulate italic)
+        """
+
+        name = simplify_name(name)
+        style = "bold" * bold + "italic" * italic
+
+        # Bundled fonts
+        if name + style in self.bundled:
+            return self.bundled[name + style], False, False
+        if name in self.bundled:
+            return self.bundled[name], bold, italic
+
+        # System fonts, searched for only if the cache does not have them or the cached file is gone
+        key = f"{name}:{style}"
+        entry = self.paths.get(key)
+        if entry is None or (entry["path"] is not None and not os.path.exists(entry["path"])):
+            self.system_lookups += 1
+            path, size, set_bold, set_italic = pygame.font.SysFont(name, 0, bold, italic,
+                                                                   constructor=lambda *resolution: resolution)
+            entry = self.paths[key] = {"path": path, "bold": set_bold, "italic": set_italic}
+            self._write_cache()
+        return entry["path"], entry["bold"], entry["italic"]
+
+    def get(self, name, size, bold=False, italic=False):
+        """
+        Returns the font of the given name, size and style, creating it the first time it is asked for
+        Takes the same arguments as pygame.font.SysFont
+        :param name: str
+        :param size: int
+        :param bold: bool
+        :param italic: bool
+        :return: pygame.font.Font
+        """
+
+        key = (simplify_name(name), size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            path, set_bold, set_italic = self.resolve(name, bold, italic)
+            font = self.fonts[key] = pygame.font.Font(path, size)
+            if set_bold:
+                font.set_bold(True)
+            if set_italic:
+                font.set_italic(True)
+        return font
+
+    def _write_cache(self):
+        """
+        Writes the resolved system fonts to the cache file, leaving the cache as it was if it cannot be written
+        :return: None
+        """
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temporary_path = self.cache_path + ".tmp"
+            with open(temporary_path, "w") as file:
+                json.dump({"version": CACHE_VERSION, "paths": self.paths}, file, sort_keys=True)
+            os.replace(temporary_path, self.cache_path)
+        except OSError:
+            pass
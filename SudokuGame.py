@@ -3,10 +3,17 @@ This file consists the entirety of the sudoku game itself
 """
 # Handle imports
 import pygame
-from Sudoku import Sudoku
+from Sudoku import Sudoku, Difficulty
+from SudokuPool import PuzzlePool
+from SudokuBank import PuzzleBank
+from SudokuRender import DamageTracker, FrameScheduler, GlyphCache
+from SudokuAssets import Assets
+from SudokuFonts import FontManager
+from SudokuProfiler import Profiler
 from enum import Enum
-from math import trunc
+from math import trunc, exp
 import time
+import os
 
 
 # Setting up state enums
@@ -18,17 +25,8 @@ class State(Enum):
     DiffSelection = 1,
     Playing = 2,
     Paused = 3,
-    Scores = 4
-
-
-class Difficulty:
-    """
-    This is a class containing the difficulty values for the sudoku puzzle
-    """
-    Easy = 10
-    Medium = 20
-    Hard = 30
-    Expert = 40
+    Scores = 4,
+    Generating = 5
 
 
 class Colors:
@@ -53,7 +51,11 @@ class Game:
     """
     This is the master game object which controls the control flow of the game
     """
-    def __init__(self):
+    def __init__(self, fps=60):
+        """
+        Sets up the game and runs it until the window is closed
+        :param fps: int (frame rate cap while the game is active)
+        """
         # PyGame Attributes
         self.window = None
         self.WIDTH = 825
@@ -68,23 +70,28 @@ class Game:
         self.current_highlighted_button = None
         self.grid = pygame.Rect(self.GRID_PADDING[0], self.GRID_PADDING[1], 9*self.CELL_SIZE, 9*self.CELL_SIZE)
 
+        # Images, named by their file in Resources/ and loaded when they are first drawn
+        self.launch_time = time.perf_counter()
+        self.assets = Assets("Resources")
+
         # Intro attributes
-        self.intro_screen = pygame.image.load("Resources/SudokuForeverIntroPage.png")
-        self.intro_countdown = 100
+        self.intro_screen = "SudokuForeverIntroPage"
+        self.INTRO_BLINK_PERIOD = 1.0
+        self.intro_countdown = self.INTRO_BLINK_PERIOD
 
         # Diff selection attributes
-        self.easy_box = (pygame.image.load("Resources/EasyBox.png"), pygame.image.load("Resources/EasyBoxHighlighted.png"))
+        self.easy_box = ("EasyBox", "EasyBoxHighlighted")
         self.easy_box_rect = pygame.Rect(75, 75, 300, 175)
-        self.easy_box_text = pygame.image.load("Resources/EasyBoxText.png")
-        self.medium_box = (pygame.image.load("Resources/MediumBox.png"), pygame.image.load("Resources/MediumBoxHighlighted.png"))
+        self.easy_box_text = "EasyBoxText"
+        self.medium_box = ("MediumBox", "MediumBoxHighlighted")
         self.medium_box_rect = pygame.Rect(450, 75, 300, 175)
-        self.medium_box_text = pygame.image.load("Resources/MediumBoxText.png")
-        self.hard_box = (pygame.image.load("Resources/HardBox.png"), pygame.image.load("Resources/HardBoxHighlighted.png"))
+        self.medium_box_text = "MediumBoxText"
+        self.hard_box = ("HardBox", "HardBoxHighlighted")
         self.hard_box_rect = pygame.Rect(75, 325, 300, 175)
-        self.hard_box_text = pygame.image.load("Resources/HardBoxText.png")
-        self.expert_box = (pygame.image.load("Resources/ExpertBox.png"), pygame.image.load("Resources/ExpertBoxHighlighted.png"))
+        self.hard_box_text = "HardBoxText"
+        self.expert_box = ("ExpertBox", "ExpertBoxHighlighted")
         self.expert_box_rect = pygame.Rect(450, 325, 300, 175)
-        self.expert_box_text = pygame.image.load("Resources/ExpertBoxText.png")
+        self.expert_box_text = "ExpertBoxText"
 
         self.diff = {Difficulty.Easy: "EASY",
                      Difficulty.Medium: "MEDIUM",
@@ -110,36 +117,48 @@ class Game:
         pygame.init()
         self.window = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Sudoku Forever!")
-        self.sudoku_bg = pygame.image.load("Resources/SudokuBG.png")
+        # Where the mouse was at the last event, so the game only depends on the events it is given
+        self.mouse_position = pygame.mouse.get_pos()
+        self.sudoku_bg = "SudokuBG"
+        self.damage = DamageTracker((self.WIDTH, self.HEIGHT))
+        self.static_layers = {}
+        self.FPS = fps
+        self.scheduler = FrameScheduler(self.FPS)
 
         # Progress bar
         self.current_progress = 0
+        # Rates (per second) at which the progress bar eases towards the completion percentage
+        self.PROGRESS_RATE = 2.4
+        self.PAUSED_PROGRESS_RATE = 0.6
         self.progress_bar_rect = pygame.Rect(self.grid.x, self.grid.y + self.grid.height + 25 // 2, self.grid.width, 25)
 
         # Buttons
-        self.small_play_button = (pygame.image.load("Resources/PlayButtonIdle.png"), pygame.image.load("Resources/PlayButtonActive.png"))
-        self.big_play_button = pygame.image.load("Resources/PlayButton.png")
-        self.small_pause_button = (pygame.image.load("Resources/PauseButtonIdle.png"), pygame.image.load("Resources/PauseButtonActive.png"))
+        self.small_play_button = ("PlayButtonIdle", "PlayButtonActive")
+        self.big_play_button = "PlayButton"
+        self.small_pause_button = ("PauseButtonIdle", "PauseButtonActive")
         self.pause_toggle_rect = pygame.Rect(self.WIDTH - 11 - 32, 11, 32, 32)
         self.number_input_buttons_rect = pygame.Rect(2*self.GRID_PADDING[0] + 9*self.CELL_SIZE,
                                                      self.GRID_PADDING[1] + 9*self.CELL_SIZE//8,
                                                      9*self.CELL_SIZE//2, 9*self.CELL_SIZE//2)
-        self.undo_button = pygame.image.load("Resources/UndoButton.png")
+        self.undo_button = "UndoButton"
         self.undo_button_rect = pygame.Rect(self.number_input_buttons_rect.x,
                                             self.number_input_buttons_rect.y +
                                             self.number_input_buttons_rect.height - 1,
-                                            self.undo_button.get_width() + 2, self.undo_button.get_height())
-        self.redo_button = pygame.image.load("Resources/RedoButton.png")
+                                            self.assets.get_size(self.undo_button)[0] + 2,
+                                            self.assets.get_size(self.undo_button)[1])
+        self.redo_button = "RedoButton"
         self.redo_button_rect = pygame.Rect(self.number_input_buttons_rect.x + 1 +
                                             self.number_input_buttons_rect.width//2,
                                             self.number_input_buttons_rect.y +
                                             self.number_input_buttons_rect.height - 1,
-                                            self.redo_button.get_width(), self.redo_button.get_height())
-        self.marking_button = pygame.image.load("Resources/MarkButton.png")
+                                            self.assets.get_size(self.redo_button)[0],
+                                            self.assets.get_size(self.redo_button)[1])
+        self.marking_button = "MarkButton"
         self.marking_button_rect = pygame.Rect(self.undo_button_rect.x,
                                                self.undo_button_rect.y + self.undo_button_rect.height - 1,
-                                               self.marking_button.get_width() + 2, self.marking_button.get_height())
-        self.erase_button = pygame.image.load("Resources/EraseButton.png")
+                                               self.assets.get_size(self.marking_button)[0] + 2,
+                                               self.assets.get_size(self.marking_button)[1])
+        self.erase_button = "EraseButton"
         self.erase_button_rect = pygame.Rect(self.marking_button_rect.x + self.marking_button_rect.width - 1,
                                              self.marking_button_rect.y,
                                              self.redo_button_rect.width, self.redo_button_rect.height)
@@ -148,23 +167,58 @@ class Game:
         self.newgame_button_rect = pygame.Rect(self.number_input_buttons_rect.x, self.progress_bar_rect.y - 3,
                                                self.number_input_buttons_rect.width, 9 * self.CELL_SIZE // 8 - 10)
 
+        self.ALERT_TIME = 2.5
         self.alert_timer = 0
 
+        # Puzzle generation, which runs in the background while a progress bar fills up to the time limit
+        # Past the time limit the best puzzle generated so far is played, and clicking or escape cancels it
+        self.GENERATION_TIME_LIMIT = 3.0
+        # Seconds to wait for a puzzle before showing the progress bar, so a quick one does not flash it
+        self.GENERATION_WAIT = 0.1
+        self.generation_job = None
+        self.generation_bar_rect = pygame.Rect(self.WIDTH//4, self.HEIGHT//2, self.WIDTH//2, 25)
+
         self.home_button = pygame.Rect(self.WIDTH//12, 4*self.HEIGHT//5, 2*self.WIDTH//9, self.HEIGHT//10)
         self.exit_button = pygame.Rect(self.WIDTH // 12 + 4*self.WIDTH//9 + 2*self.WIDTH//12, 4 * self.HEIGHT // 5,
                                        2*self.WIDTH // 9, self.HEIGHT // 10)
 
-        # Fonts
-        self.grid_font = pygame.font.SysFont("calibri", (3*self.CELL_SIZE)//5)
-        self.number_font = pygame.font.SysFont("calibri", self.number_input_buttons_rect.width//5)
-        self.button_font = pygame.font.SysFont("calibri", self.undo_button.get_height()//4)
-        self.button_font2 = pygame.font.SysFont("calibri", (3*self.CELL_SIZE)//5, True)
-        self.small_font = pygame.font.SysFont("calibri", 14, True)
-        self.timer_font = pygame.font.SysFont("Calibri", self.pause_toggle_rect.width//2, True)
-        self.heading_font = pygame.font.SysFont("calibri", self.number_input_buttons_rect.width//5, True)
+        # Fonts, from Resources/ if they are bundled there and from the system fonts otherwise
+        self.fonts = FontManager("Resources")
+        self.grid_font = self.fonts.get("calibri", (3*self.CELL_SIZE)//5)
+        self.number_font = self.fonts.get("calibri", self.number_input_buttons_rect.width//5)
+        self.button_font = self.fonts.get("calibri", self.assets.get_size(self.undo_button)[1]//4)
+        self.button_font2 = self.fonts.get("calibri", (3*self.CELL_SIZE)//5, True)
+        self.small_font = self.fonts.get("calibri", 14, True)
+        self.timer_font = self.fonts.get("Calibri", self.pause_toggle_rect.width//2, True)
+        self.heading_font = self.fonts.get("calibri", self.number_input_buttons_rect.width//5, True)
+        self.profiler_font = self.fonts.get("calibri", 12)
+
+        # Frame and puzzle timings, shown over the game with F3 and written to PROFILE_PATH .json and .csv with F4
+        self.profiler = Profiler()
+        self.show_profiler = False
+        self.PROFILER_POSITION = (5, 5)
+        self.PROFILE_PATH = "SudokuProfile"
+
+        # Rendered text, with the digits of the grid, the pencil marks and the number buttons rendered up front
+        self.glyphs = GlyphCache()
+        digits = [str(n) for n in range(1, 10)]
+        self.glyphs.preload(self.grid_font, digits, (Colors.Black, Colors.Azure, Colors.ImperialRed))
+        self.glyphs.preload(self.small_font, digits, (Colors.IndigoDye,))
+        self.glyphs.preload(self.number_font, digits, (Colors.Black,))
 
         # Game attributes
-        self.puzzle = Sudoku()
+        self.PUZZLE_POOL_SIZE = 3
+        self.puzzle_pool = PuzzlePool([Difficulty.Easy, Difficulty.Medium, Difficulty.Hard, Difficulty.Expert],
+                                      self.PUZZLE_POOL_SIZE)
+        self.PUZZLE_BANK_PATH = "Resources/Puzzles.bank"
+        self.puzzle_bank = PuzzleBank(self.PUZZLE_BANK_PATH) if os.path.exists(self.PUZZLE_BANK_PATH) else None
+        self.puzzle = Sudoku(self.puzzle_pool, self.puzzle_bank)
+        self.puzzle.add_listener(self._on_puzzle_change)
+        self.profiler.instrument(self.puzzle, ("initialize_puzzle", "start_puzzle", "set_puzzle", "clear_data", "insert",
+                                               "remove", "undo", "redo"), "Sudoku.")
+        self.completion_percentage = 0
+        self.completion_message = ""
+        self.completion_message_timer = 0
         self.not_ticking = True
         self.start_time = 0
         self.play_time = 0
@@ -177,11 +231,178 @@ class Game:
 
         self._draw()
 
+    def _on_puzzle_change(self, event, *details):
+        """
+        Keeps the completion percentage up to date and announces completed rows, columns and boxes
+        :param event: str
+        :param details: Any
+        :return: None
+        """
+
+        if event == "progress":
+            self.completion_percentage = details[0]
+        elif event == "completed":
+            kind, index = details
+            self.completion_message = f"{kind.upper()} {index + 1} COMPLETED!"
+            self.completion_message_timer = self.ALERT_TIME
+
+    def _start_puzzle(self, difficulty):
+        """
+        Starts getting a puzzle of the difficulty, and plays it if it is ready in time,
+        or shows the progress of its generation until it is
+        :param difficulty: int
+        :return: None
+        """
+        self.generation_job = self.puzzle.start_puzzle(difficulty, self.GENERATION_TIME_LIMIT)
+        if self.generation_job.wait(self.GENERATION_WAIT):
+            self._finish_puzzle()
+        else:
+            self.state = State.Generating
+
+    def _finish_puzzle(self):
+        """
+        Plays the puzzle of the finished generation job
+        :return: None
+        """
+        self.puzzle.set_puzzle(self.generation_job.difficulty, self.generation_job.get_result(),
+                               self.generation_job.puzzle_id)
+        # Units filled by the given numbers are completed by set_puzzle, but not by the player
+        self.completion_message_timer = 0
+        self.generation_job = None
+        self.state = State.Playing
+
+    def _update_timers(self, seconds):
+        """
+        Advances the timers and animations of the current state by the seconds passed since the last frame
+        :param seconds: float
+        :return: None
+        """
+        if self.state is State.Intro:
+            self.intro_countdown = (self.intro_countdown - seconds) % self.INTRO_BLINK_PERIOD
+        elif self.state is State.Playing:
+            self.play_time = round(time.time() - self.start_time - self.cum_pause_time, 2)
+            self._ease_progress(self.PROGRESS_RATE, seconds)
+            self.alert_timer = max(0, self.alert_timer - seconds)
+            if not self.alert_timer:
+                self.completion_message_timer = max(0, self.completion_message_timer - seconds)
+        elif self.state is State.Paused:
+            self.pause_time = time.time() - self.pause_start_time
+            self._ease_progress(self.PAUSED_PROGRESS_RATE, seconds)
+
+    def _ease_progress(self, rate, seconds):
+        """
+        Moves the progress bar towards the completion percentage, by the same share of the distance every second
+        :param rate: float
+        :param seconds: float
+        :return: None
+        """
+        self.current_progress += (self.completion_percentage - self.current_progress) * (1 - exp(-rate * seconds))
+        # Stop easing once the difference is far below a pixel
+        if abs(self.completion_percentage - self.current_progress) < 0.01:
+            self.current_progress = self.completion_percentage
+
+    def _is_idle(self):
+        """
+        Checks if nothing on the screen changes until the next event, and sets a timer for the next
+        change of an idle screen that is still animating
+        :return: bool
+        """
+        # The state changed while the last frame was drawn, so the new screen is not drawn yet
+        if self.state != self.damage.state:
+            return False
+        if self.state is State.Intro:
+            # Wake up when the text blinks
+            self.scheduler.wake_up_in(self.intro_countdown % (self.INTRO_BLINK_PERIOD / 2))
+            return True
+        if self.state is State.Paused:
+            return self.current_progress == self.completion_percentage
+        return self.state in (State.DiffSelection, State.Scores)
+
+    def _get_profiler_rect(self):
+        """
+        Returns the rectangle of the profiler overlay
+        :return: pygame.Rect
+        """
+        return pygame.Rect(self.PROFILER_POSITION, self.profiler.get_overlay_size(self.profiler_font))
+
+    def _get_damage_regions(self):
+        """
+        Returns the regions of the current state that can change, with the values they are drawn from
+        :return: Dict[Hashable, Tuple[pygame.Rect, Hashable]]
+        """
+        mouse = self.mouse_position
+        regions = {}
+
+        if self.state is State.Intro:
+            regions["Text"] = (pygame.Rect(0, 2*self.HEIGHT//3, self.WIDTH, self.HEIGHT//3), self.intro_countdown >= self.INTRO_BLINK_PERIOD / 2)
+
+        elif self.state is State.DiffSelection:
+            for name, rect in (("Easy", self.easy_box_rect), ("Medium", self.medium_box_rect),
+                               ("Hard", self.hard_box_rect), ("Expert", self.expert_box_rect)):
+                regions[name] = (rect, rect.collidepoint(mouse))
+
+        elif self.state in (State.Playing, State.Paused):
+            # Score, error count, timer and pause button above the grid
+            ticking = self.state is State.Playing and self.start_time != 0
+            regions["Header"] = (pygame.Rect(0, 0, self.WIDTH, self.GRID_PADDING[1] - 2),
+                                 (int(self.play_time * 100) if ticking else None, self.completion_percentage,
+                                  self.error_count, self.pause_toggle_rect.collidepoint(mouse)))
+            regions["Progress"] = (pygame.Rect(self.progress_bar_rect.x, self.progress_bar_rect.y,
+                                               self.progress_bar_rect.width,
+                                               self.progress_bar_rect.height + 5 + self.small_font.get_height()),
+                                   (int(self.current_progress*(self.progress_bar_rect.width-6)) // 100,
+                                    trunc(self.completion_percentage), self.alert_timer > 0,
+                                    self.completion_message_timer > 0 and self.completion_message))
+            regions["Numbers"] = (self.number_input_buttons_rect, self.current_highlighted_number)
+            regions["Buttons"] = (pygame.Rect(self.undo_button_rect.x, self.undo_button_rect.y,
+                                              self.number_input_buttons_rect.width, self.number_input_buttons_rect.height),
+                                  (self.current_highlighted_button, self.puzzle.is_marking))
+
+            if self.state is State.Playing:
+                cells = self.puzzle.current_sudoku_puzzle.cells
+                hovered = selected = None
+                if self.current_highlighted_cell:
+                    hovered = ((self.current_highlighted_cell[0] - self.GRID_PADDING[0])//self.CELL_SIZE,
+                               (self.current_highlighted_cell[1] - self.GRID_PADDING[1])//self.CELL_SIZE)
+                if self.current_selected_cell:
+                    selected = ((self.current_selected_cell[0] - self.GRID_PADDING[0])//self.CELL_SIZE,
+                                (self.current_selected_cell[1] - self.GRID_PADDING[1])//self.CELL_SIZE)
+                    selected_number = self.puzzle.current_sudoku_puzzle[selected[0]][selected[1]]
+
+                # Every cell is a region of its own, drawn from its number, markings and highlights
+                for i, n in enumerate(cells):
+                    x, y = i % 9, i // 9
+                    shaded = selected and (x == selected[0] or y == selected[1] or
+                                           (x//3, y//3) == (selected[0]//3, selected[1]//3))
+                    regions[(x, y)] = (pygame.Rect(self.GRID_PADDING[0] + x*self.CELL_SIZE,
+                                                   self.GRID_PADDING[1] + y*self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE),
+                                       (n, self.puzzle.sudoku_puzzle.cells[i], self.puzzle.sudoku_completed.cells[i],
+                                        tuple(self.puzzle.markings.get((x, y), ())), (x, y) == hovered, shaded,
+                                        (x, y) == selected, selected is not None and n != 0 and n == selected_number,
+                                        (x, y) in self.puzzle.conflicts))
+
+        elif self.state is State.Generating:
+            regions["Progress"] = (self.generation_bar_rect,
+                                   int(self.generation_job.get_progress() * (self.generation_bar_rect.width - 8)))
+
+        elif self.state is State.Scores:
+            regions["Home"] = (self.home_button, self.home_button.collidepoint(mouse))
+            regions["Exit"] = (self.exit_button, self.exit_button.collidepoint(mouse))
+
+        # The profiler overlay changes 4 times a second at 60 frames per second
+        regions["Profiler"] = (self._get_profiler_rect(),
+                               (self.show_profiler, self.show_profiler and self.profiler.get_overlay_version()))
+
+        return regions
+
     def _update_state_function(self):
         """
         Handle states an draw them
         :return: None
         """
+        if self.state is State.Generating and self.generation_job.is_done():
+            self._finish_puzzle()
+
         if self.state is State.Intro:
             self.state_function = self._draw_intro
         elif self.state is State.Playing:
@@ -192,18 +413,35 @@ class Game:
             self.state_function = self._draw_diff_selection
         elif self.state is State.Scores:
             self.state_function = self._draw_scores
+        elif self.state is State.Generating:
+            self.state_function = self._draw_generating
 
-    def _handle_events(self):
+    def _handle_events(self, events):
         """
-        Handles a pygame event based on the current state
+        Handles the pygame events based on the current state
+        :param events: List[pygame.event.Event]
         :return: bool
         """
         # Handling events
-        for event in pygame.event.get():
+        for event in events:
             # Quitting the game
             if event.type == pygame.QUIT:
                 return False
 
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.mouse_position = event.pos
+
+            # Redraw the whole window once it is uncovered or restored, since only damaged regions are sent to it
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED):
+                self.damage.invalidate()
+
+            # Profiler overlay and export, in every state
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.export(self.PROFILE_PATH + ".json")
+                self.profiler.export(self.PROFILE_PATH + ".csv")
+
             # Intro Events
             if self.state == State.Intro:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 or \
@@ -215,33 +453,29 @@ class Game:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if self.easy_box_rect.collidepoint(event.pos):
                         self.difficulty = Difficulty.Easy
-                        self.puzzle.initialize_puzzle(self.difficulty)
-                        self.state = State.Playing
+                        self._start_puzzle(self.difficulty)
 
                     if self.medium_box_rect.collidepoint(event.pos):
                         self.difficulty = Difficulty.Medium
-                        self.puzzle.initialize_puzzle(self.difficulty)
-                        self.state = State.Playing
+                        self._start_puzzle(self.difficulty)
 
                     if self.hard_box_rect.collidepoint(event.pos):
                         self.difficulty = Difficulty.Hard
-                        self.puzzle.initialize_puzzle(self.difficulty)
-                        self.state = State.Playing
+                        self._start_puzzle(self.difficulty)
 
                     if self.expert_box_rect.collidepoint(event.pos):
                         self.difficulty = Difficulty.Expert
-                        self.puzzle.initialize_puzzle(self.difficulty)
-                        self.state = State.Playing
+                        self._start_puzzle(self.difficulty)
 
             # Playing Events
             elif self.state == State.Playing:
                 # Keyboard inputs
                 if event.type == pygame.KEYDOWN:
                     # Undo when ctrl+z is pressed
-                    if event.key == pygame.K_z and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    if event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
                         self.puzzle.undo()
                     # Redo when ctrl+r is pressed
-                    if event.key == pygame.K_r and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    if event.key == pygame.K_r and event.mod & pygame.KMOD_CTRL:
                         self.puzzle.redo()
 
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.not_ticking and not \
@@ -250,7 +484,7 @@ class Game:
                     self.not_ticking = False
 
                 # Check if the mouse is on the grid
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = self.mouse_position
                 if self.grid.collidepoint(mouse_x, mouse_y):
                     self.current_highlighted_cell = (self.GRID_PADDING[0] +
                                                      (mouse_x - self.GRID_PADDING[0]) // self.CELL_SIZE * self.CELL_SIZE,
@@ -292,7 +526,7 @@ class Game:
                             if self.puzzle.current_sudoku_puzzle[x][y] != self.puzzle.sudoku_completed[x][y]:
                                 self.error_count += 1
                         else:
-                            self.alert_timer = 750
+                            self.alert_timer = self.ALERT_TIME
 
                 # Undo Button
                 elif self.undo_button_rect.collidepoint(mouse_x, mouse_y):
@@ -340,7 +574,7 @@ class Game:
                 # Newgame Button
                 elif self.newgame_button_rect.collidepoint(mouse_x, mouse_y):
                     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        self.puzzle.initialize_puzzle(self.difficulty)
+                        self._start_puzzle(self.difficulty)
                         time.sleep(0.5)
                         self.start_time = 0
                         self.play_time = 0
@@ -372,11 +606,12 @@ class Game:
                             or self.marking_button_rect.collidepoint(event.pos)\
                             or self.restart_button_rect.collidepoint(event.pos)\
                             or self.newgame_button_rect.collidepoint(event.pos):
+                        # The pause time of the last frame drawn is stale if the paused screen was idle since
                         if not self.start_time == 0:
-                            self.cum_pause_time += self.pause_time
+                            self.cum_pause_time += time.time() - self.pause_start_time
                         self.state = State.Playing
 
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = self.mouse_position
                 if self.number_input_buttons_rect.collidepoint(mouse_x, mouse_y):
                     self.current_highlighted_button = None
                     self.current_highlighted_number = pygame.Rect(self.number_input_buttons_rect.x +
@@ -441,6 +676,16 @@ class Game:
                     elif self.exit_button.collidepoint(event.pos):
                         return False
 
+            # Generating events
+            elif self.state is State.Generating:
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 or \
+                        event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    self.generation_job.cancel()
+                    self.generation_job = None
+                    self.state = State.DiffSelection
+                    self.current_progress = 0
+                    self.current_selected_cell = None
+
             # TODO: HighScore Events
 
         return True
@@ -450,16 +695,12 @@ class Game:
         Handles all the drawing activities in the Intro state
         :return: None
         """
-        self.intro_countdown -= 1
-        if self.intro_countdown < 0:
-            self.intro_countdown = 100
-
         # Draw the intro screen
-        self.window.blit(self.intro_screen, (0, 0))
+        self.window.blit(self.assets.get(self.intro_screen), (0, 0))
 
         # Draw the intro screen text
-        text = self.button_font2.render("CLICK TO PLAY!", True, Colors.Black)
-        if self.intro_countdown >= 50:
+        text = self.glyphs.render(self.button_font2, "CLICK TO PLAY!", True, Colors.Black)
+        if self.intro_countdown >= self.INTRO_BLINK_PERIOD / 2:
             self.window.blit(text, (self.WIDTH//2 - text.get_width()//2, 5*self.HEIGHT//6 - text.get_height()//2))
 
     def _draw_diff_selection(self):
@@ -468,17 +709,269 @@ class Game:
         :return: None
         """
         # Draw the text boxes
-        self.window.blit(self.sudoku_bg, (0, 0))
-        self.window.blit(self.easy_box[self.easy_box_rect.collidepoint(pygame.mouse.get_pos())], self.easy_box_rect[:2])
-        self.window.blit(self.medium_box[self.medium_box_rect.collidepoint(pygame.mouse.get_pos())],
+        self.window.blit(self.assets.get(self.sudoku_bg), (0, 0))
+        self.window.blit(self.assets.get(self.easy_box[self.easy_box_rect.collidepoint(self.mouse_position)]),
+                         self.easy_box_rect[:2])
+        self.window.blit(self.assets.get(self.medium_box[self.medium_box_rect.collidepoint(self.mouse_position)]),
                          self.medium_box_rect[:2])
-        self.window.blit(self.hard_box[self.hard_box_rect.collidepoint(pygame.mouse.get_pos())], self.hard_box_rect[:2])
-        self.window.blit(self.expert_box[self.expert_box_rect.collidepoint(pygame.mouse.get_pos())], self.expert_box_rect[:2])
+        self.window.blit(self.assets.get(self.hard_box[self.hard_box_rect.collidepoint(self.mouse_position)]),
+                         self.hard_box_rect[:2])
+        self.window.blit(self.assets.get(self.expert_box[self.expert_box_rect.collidepoint(self.mouse_position)]),
+                         self.expert_box_rect[:2])
+
+        self.window.blit(self.assets.get(self.easy_box_text), self.easy_box_rect[:2])
+        self.window.blit(self.assets.get(self.medium_box_text), self.medium_box_rect[:2])
+        self.window.blit(self.assets.get(self.hard_box_text), self.hard_box_rect[:2])
+        self.window.blit(self.assets.get(self.expert_box_text), self.expert_box_rect[:2])
+
+    def _draw_generating(self):
+        """
+        Handles all the drawing activities in the Generating state
+        :return: None
+        """
+        self.window.blit(self.assets.get(self.sudoku_bg), (0, 0))
+
+        text = self.glyphs.render(self.heading_font, "GENERATING PUZZLE...", True, Colors.Black)
+        self.window.blit(text, (self.WIDTH//2 - text.get_width()//2,
+                                self.generation_bar_rect.y - 3*text.get_height()//2))
+
+        # Progress bar, which is full at the time limit
+        pygame.draw.rect(self.window, Colors.White, self.generation_bar_rect)
+        pygame.draw.rect(self.window, Colors.Black, self.generation_bar_rect, 2)
+        pygame.draw.rect(self.window, Colors.Azure, (self.generation_bar_rect.x + 4, self.generation_bar_rect.y + 5,
+                                                     int(self.generation_job.get_progress() *
+                                                         (self.generation_bar_rect.width - 8)),
+                                                     self.generation_bar_rect.height - 8))
+
+        text = self.glyphs.render(self.small_font, "CLICK TO CANCEL", True, Colors.Azure)
+        self.window.blit(text, (self.generation_bar_rect.x,
+                                self.generation_bar_rect.y + self.generation_bar_rect.height + 5))
+
+    def _get_static_layers(self):
+        """
+        Returns the static layers of the current state, composing them the first time they are needed
+        The background is drawn first, the foreground (with premultiplied alpha) over the highlights
+        :return: Tuple[pygame.Surface, pygame.Surface]
+        """
+        key = (self.state, self.window.get_size())
+        if key not in self.static_layers:
+            background = pygame.Surface(self.window.get_size()).convert()
+            foreground = pygame.Surface(self.window.get_size(), pygame.SRCALPHA).convert_alpha()
+            foreground.fill((0, 0, 0, 0))
+
+            if self.state is State.Playing:
+                self._compose_board_background(background)
+                self._compose_grid_lines(foreground)
+                self._compose_controls(foreground)
+            elif self.state is State.Paused:
+                self._compose_board_background(background)
+                self._compose_paused_grid(background)
+                self._compose_controls(foreground)
+            elif self.state is State.Scores:
+                self._compose_scores_background(background)
+            self.static_layers[key] = (background, foreground)
+
+        return self.static_layers[key]
+
+    def _compose_board_background(self, surface):
+        """
+        Draws the parts of the Playing and Paused states that never change and are never drawn over
+        :param surface: pygame.Surface
+        :return: None
+        """
+        # Set bg
+        surface.blit(self.assets.get(self.sudoku_bg), (0, 0))
+        pygame.draw.rect(surface, Colors.White, self.grid)
+        pygame.draw.rect(surface, Colors.White, self.number_input_buttons_rect)
+        pygame.draw.rect(surface, Colors.White, self.progress_bar_rect)
+        pygame.draw.rect(surface, Colors.White, (self.undo_button_rect.x, self.undo_button_rect.y,
+                                                 self.number_input_buttons_rect.width, self.number_input_buttons_rect.height))
+
+        # Restart Button
+        pygame.draw.rect(surface, Colors.Azure, self.restart_button_rect)
+        pygame.draw.rect(surface, Colors.IndigoDye, self.restart_button_rect, 1)
+
+        # New Game Button
+        pygame.draw.rect(surface, Colors.ImperialRed, self.newgame_button_rect)
+        pygame.draw.rect(surface, Colors.Black, self.newgame_button_rect, 1)
+
+        # Restart Text
+        text = self.glyphs.render(self.button_font2, "RESTART", True, Colors.White)
+        surface.blit(text, (self.restart_button_rect.x + self.restart_button_rect.width//2 - text.get_width()//2,
+                            self.restart_button_rect.y + self.restart_button_rect.height//2 - text.get_height()//2 + 2))
+
+        # Newgame Text
+        text = self.glyphs.render(self.button_font2, "NEW GAME", True, Colors.White)
+        surface.blit(text, (self.newgame_button_rect.x + self.newgame_button_rect.width // 2 - text.get_width() // 2,
+                            self.newgame_button_rect.y + self.newgame_button_rect.height // 2 - text.get_height() // 2 + 2))
+
+        # Progress Bar
+        pygame.draw.rect(surface, Colors.Black, self.progress_bar_rect, 2)
+        pygame.draw.line(surface, Colors.Gainsboro, (self.progress_bar_rect.x + 2, self.progress_bar_rect.y + 3),
+                         (self.progress_bar_rect.x + self.progress_bar_rect.width - 2,
+                          self.progress_bar_rect.y + 3), 1)
+        pygame.draw.line(surface, Colors.Gainsboro, (self.progress_bar_rect.x + 2, self.progress_bar_rect.y - 3 + 25),
+                         (self.progress_bar_rect.x + self.progress_bar_rect.width - 2,
+                          self.progress_bar_rect.y + 25 - 3), 1)
+
+    def _compose_grid_lines(self, surface):
+        """
+        Draws the lines of the grid
+        :param surface: pygame.Surface
+        :return: None
+        """
+        for i in range(10):
+            pygame.draw.line(surface, Colors.Black,
+                             (self.GRID_PADDING[0] + (i * self.CELL_SIZE), self.GRID_PADDING[1]),
+                             (self.GRID_PADDING[0] + (i * self.CELL_SIZE), self.GRID_PADDING[1] + (9 * self.CELL_SIZE)),
+                             (i % 3 == 0) + 1)
+            pygame.draw.line(surface, Colors.Black,
+                             (self.GRID_PADDING[0], self.GRID_PADDING[1] + (i * self.CELL_SIZE)),
+                             (self.GRID_PADDING[0] + (9 * self.CELL_SIZE), self.GRID_PADDING[1] + (i * self.CELL_SIZE)),
+                             (i % 3 == 0) + 1)
+
+    def _compose_paused_grid(self, surface):
+        """
+        Draws the empty grid with the big play button and the paused message
+        :param surface: pygame.Surface
+        :return: None
+        """
+        # Drawing an empty grid for preventing player from watching it when paused
+        self._compose_grid_lines(surface)
+
+        # Big play button in the center of the grid
+        surface.blit(self.assets.get(self.big_play_button), (self.GRID_PADDING[0] + 9*self.CELL_SIZE//2 - 37,
+                                                             self.GRID_PADDING[1] + 9*self.CELL_SIZE//2 - 37))
+
+        # Paused Message
+        text = self.glyphs.render(self.small_font, "GAME PAUSED!", True, Colors.ImperialRed)
+        surface.blit(text, (self.progress_bar_rect.x + self.progress_bar_rect.width - text.get_width(),
+                            self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
+
+    def _compose_controls(self, surface):
+        """
+        Draws the number buttons and the undo, redo, mark and erase buttons, which go over their highlights
+        :param surface: pygame.Surface
+        :return: None
+        """
+        # Drawing the buttons
+        pygame.draw.rect(surface, Colors.Black, self.number_input_buttons_rect, 1)
+        for i in range(3):
+            pygame.draw.line(surface, Colors.Black,
+                             (self.number_input_buttons_rect.x + i * self.number_input_buttons_rect.width // 3,
+                              self.number_input_buttons_rect.y),
+                             (self.number_input_buttons_rect.x + i * self.number_input_buttons_rect.width // 3,
+                              self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
+            pygame.draw.line(surface, Colors.Black,
+                             (self.number_input_buttons_rect.x,
+                              self.number_input_buttons_rect.y + i * self.number_input_buttons_rect.width // 3),
+                             (self.number_input_buttons_rect.x + self.number_input_buttons_rect.width,
+                              self.number_input_buttons_rect.y + i * self.number_input_buttons_rect.width // 3))
 
-        self.window.blit(self.easy_box_text, self.easy_box_rect[:2])
-        self.window.blit(self.medium_box_text, self.medium_box_rect[:2])
-        self.window.blit(self.hard_box_text, self.hard_box_rect[:2])
-        self.window.blit(self.expert_box_text, self.expert_box_rect[:2])
+        # Undo button
+        surface.blit(self.assets.get(self.undo_button), (self.number_input_buttons_rect.x,
+                                                         self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
+        pygame.draw.rect(surface, Colors.Black, self.undo_button_rect, 1)
+
+        # Redo Button
+        surface.blit(self.assets.get(self.redo_button), (self.number_input_buttons_rect.x + 1 + self.number_input_buttons_rect.width//2,
+                                                         self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
+        pygame.draw.rect(surface, Colors.Black, self.redo_button_rect, 1)
+
+        # Mark Button
+        surface.blit(self.assets.get(self.marking_button), (self.marking_button_rect.x, self.marking_button_rect.y))
+        pygame.draw.rect(surface, Colors.Black, self.marking_button_rect, 1)
+
+        # Erase Button
+        surface.blit(self.assets.get(self.erase_button), (self.erase_button_rect.x, self.erase_button_rect.y))
+        pygame.draw.rect(surface, Colors.Black, self.erase_button_rect, 1)
+
+        # Drawing numbers on the buttons
+        for i in range(3):
+            for j in range(3):
+                number = self.glyphs.render(self.number_font, str(3 * i + j + 1), True, Colors.Black)
+                surface.blit(number,
+                             ((self.number_input_buttons_rect.x + (2 * j + 1) * self.number_input_buttons_rect.width // 6 -
+                               number.get_width() // 2),
+                              (self.number_input_buttons_rect.y + (2 * i + 1) * self.number_input_buttons_rect.width // 6 -
+                               number.get_height() // 3)))
+        # Undo text
+        text = self.glyphs.render(self.button_font, "UNDO", True, Colors.Black)
+        surface.blit(text, (self.undo_button_rect.x + self.assets.get_size(self.undo_button)[0]//2 - text.get_width()//2,
+                            self.undo_button_rect.y + 5*self.assets.get_size(self.undo_button)[1]//6 - text.get_height()//2 + 3))
+        # Redo text
+        text = self.glyphs.render(self.button_font, "REDO", True, Colors.Black)
+        surface.blit(text, (self.redo_button_rect.x + 2 + self.assets.get_size(self.redo_button)[0] // 2 - text.get_width() // 2,
+                            self.redo_button_rect.y + 5 * self.assets.get_size(self.undo_button)[1] // 6 - text.get_height() // 2 + 3))
+
+        # Mark text
+        text = self.glyphs.render(self.button_font, "MARK", True, Colors.Black)
+        surface.blit(text, (self.marking_button_rect.x + self.marking_button_rect.width//2 - text.get_width()//2,
+                            self.marking_button_rect.y + 5 * self.marking_button_rect.height//6 - text.get_height() // 2 + 3))
+
+        # Erase text
+        text = self.glyphs.render(self.button_font, "ERASE", True, Colors.Black)
+        surface.blit(text, (self.erase_button_rect.x + 2 + self.erase_button_rect.width // 2 - text.get_width() // 2,
+                            self.erase_button_rect.y + 5 * self.erase_button_rect.height // 6 - text.get_height() // 2 + 3))
+
+    def _compose_scores_background(self, surface):
+        """
+        Draws the headings and labels of the Scores state
+        :param surface: pygame.Surface
+        :return: None
+        """
+        surface.blit(self.assets.get(self.sudoku_bg), (0, 0))
+
+        text = self.glyphs.render(self.heading_font, "CONGRATULATIONS! PUZZLE COMPLETED!!", True, Colors.IndigoDye)
+        surface.blit(text, (self.WIDTH // 2 - text.get_width() // 2 - 2, self.HEIGHT // 8 - text.get_height() // 2 + 2))
+        text = self.glyphs.render(self.heading_font, "CONGRATULATIONS! PUZZLE COMPLETED!!", True, Colors.Azure)
+        surface.blit(text, (self.WIDTH//2 - text.get_width()//2, self.HEIGHT//8 - text.get_height()//2))
+
+        # Particulars
+        text = self.glyphs.render(self.button_font2, "COMPLETION SCORE :", True, Colors.Black)
+        surface.blit(text, (self.WIDTH//5, self.HEIGHT//2 - 3*text.get_height() // 2 - text.get_height()))
+        text = self.glyphs.render(self.button_font2, "BONUS SCORE :", True, Colors.Black)
+        surface.blit(text, (self.WIDTH // 5, self.HEIGHT // 2 - text.get_height() // 2 - text.get_height()))
+        text = self.glyphs.render(self.button_font2, "ERRORS :", True, Colors.Black)
+        surface.blit(text, (self.WIDTH // 5, self.HEIGHT // 2 + text.get_height() // 2 - text.get_height()))
+
+        pygame.draw.line(surface, Colors.Black, (self.WIDTH//5, self.HEIGHT//2 + text.get_height()),
+                         (4*self.WIDTH//5, self.HEIGHT//2 + text.get_height()), 2)
+
+        text = self.glyphs.render(self.button_font2, "TOTAL SCORE :", True, Colors.ImperialRed)
+        surface.blit(text, (self.WIDTH // 5, self.HEIGHT // 2 + 2*text.get_height()))
+
+    def _draw_marking_toggle(self):
+        """
+        Draws the ON/OFF toggle of the mark button
+        :return: None
+        """
+        if self.puzzle.is_marking:
+            text = self.glyphs.render(self.small_font, "ON", True, Colors.White)
+            pygame.draw.ellipse(self.window, Colors.Azure, (self.marking_button_rect.x + 84 - text.get_width(),
+                                                            self.marking_button_rect.y + 48 - text.get_height(),
+                                                            2 * text.get_width(), 2 * text.get_height()))
+            self.window.blit(text, (self.marking_button_rect.x + 84 - text.get_width() // 2,
+                                    self.marking_button_rect.y + 48 - text.get_height() // 2))
+        else:
+            text = self.glyphs.render(self.small_font, "OFF", True, Colors.Black)
+            pygame.draw.ellipse(self.window, Colors.Gainsboro, (self.marking_button_rect.x + 84 - text.get_width(),
+                                                                self.marking_button_rect.y + 48 - text.get_height(),
+                                                                2 * text.get_width(), 2 * text.get_height()))
+            self.window.blit(text, (self.marking_button_rect.x + 84 - text.get_width() // 2,
+                                    self.marking_button_rect.y + 48 - text.get_height() // 2))
+
+    def _draw_progress(self):
+        """
+        Draws the filled part of the progress bar and the completion percentage
+        :return: None
+        """
+        pygame.draw.rect(self.window, Colors.Azure, (self.progress_bar_rect.x + 4, self.progress_bar_rect.y + 5,
+                                                     int(self.current_progress*(self.progress_bar_rect.width-6)) // 100, 25 - 8))
+        text = self.glyphs.render(self.small_font, "COMPLETION: {0}%".format(trunc(self.completion_percentage)),
+                                  True, Colors.Azure)
+        self.window.blit(text, (self.progress_bar_rect.x,
+                                self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
 
     def _draw_playing(self):
         """
@@ -486,15 +979,8 @@ class Game:
         :return: None
         """
         # Set bg
-        self.window.blit(self.sudoku_bg, (0, 0))
-        pygame.draw.rect(self.window, Colors.White, self.grid)
-        pygame.draw.rect(self.window, Colors.White, self.number_input_buttons_rect)
-        pygame.draw.rect(self.window, Colors.White, self.progress_bar_rect)
-        pygame.draw.rect(self.window, Colors.White, (self.undo_button_rect.x, self.undo_button_rect.y,
-                                                     self.number_input_buttons_rect.width, self.number_input_buttons_rect.height))
-
-        # Update the timer
-        self.play_time = round(time.time() - self.start_time - self.cum_pause_time, 2)
+        background, foreground = self._get_static_layers()
+        self.window.blit(background, (0, 0))
 
         # Draw the current cell that the mouse is hovering over
         if self.current_highlighted_cell:
@@ -526,41 +1012,20 @@ class Game:
             # The selected box
             pygame.draw.rect(self.window, Colors.BabyBlue, self.current_selected_cell)
 
-        # Draw a red box for wrong entries
-        wrong_number_entries = self.puzzle.get_wrong_entries()
-        for wrong_entry in wrong_number_entries:
-            # Clash in column
-            clash_column = [pygame.Rect(self.GRID_PADDING[0] + wrong_entry[0]*self.CELL_SIZE,
-                                        self.GRID_PADDING[1] + y*self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE)
-                            for y in range(9) if wrong_entry[2] == self.puzzle.current_sudoku_puzzle[wrong_entry[0]][y]
-                            and not (wrong_entry[0], y) == (wrong_entry[0], wrong_entry[1])]
-            # Clash in row
-            clash_row = [pygame.Rect(self.GRID_PADDING[0] + x*self.CELL_SIZE,
-                                     self.GRID_PADDING[1] + wrong_entry[1]*self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE)
-                         for x in range(9) if wrong_entry[2] == self.puzzle.current_sudoku_puzzle[x][wrong_entry[1]]
-                         and not (x, wrong_entry[1]) == (wrong_entry[0], wrong_entry[1])]
-
-            # Clash in box
-            clash_box = [pygame.Rect(self.GRID_PADDING[0] + x*self.CELL_SIZE,
-                                     self.GRID_PADDING[1] + y*self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE)
-                         for x in range(wrong_entry[0]//3*3, wrong_entry[0]//3*3+3)
-                         for y in range(wrong_entry[1]//3*3, wrong_entry[1]//3*3+3)
-                         if wrong_entry[2] == self.puzzle.current_sudoku_puzzle[x][y]
-                         and not (x, y) == (wrong_entry[0], wrong_entry[1])]
-
-            for box in clash_box + clash_column + clash_row:
-                pygame.draw.rect(self.window, Colors.LightCoral, box)
-
-        # Drawing the grid
-        for i in range(10):
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.GRID_PADDING[0] + (i * self.CELL_SIZE), self.GRID_PADDING[1]),
-                             (self.GRID_PADDING[0] + (i * self.CELL_SIZE), self.GRID_PADDING[1] + (9 * self.CELL_SIZE)),
-                             (i % 3 == 0) + 1)
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.GRID_PADDING[0], self.GRID_PADDING[1] + (i * self.CELL_SIZE)),
-                             (self.GRID_PADDING[0] + (9 * self.CELL_SIZE), self.GRID_PADDING[1] + (i * self.CELL_SIZE)),
-                             (i % 3 == 0) + 1)
+        # Draw a red box for the positions that clash with a wrong entry
+        for x, y in self.puzzle.conflicts:
+            pygame.draw.rect(self.window, Colors.LightCoral,
+                             (self.GRID_PADDING[0] + x*self.CELL_SIZE, self.GRID_PADDING[1] + y*self.CELL_SIZE,
+                              self.CELL_SIZE, self.CELL_SIZE))
+
+        # Highlighted buttons
+        if self.current_highlighted_number:
+            pygame.draw.rect(self.window, Colors.LightGray, self.current_highlighted_number)
+        if self.current_highlighted_button:
+            pygame.draw.rect(self.window, Colors.LightGray, self.current_highlighted_button)
+
+        # The grid lines and the buttons go over the highlights
+        self.window.blit(foreground, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
 
         # Drawing the numbers on the grid
         for x in range(9):
@@ -570,161 +1035,57 @@ class Game:
                     # If it is a non-block number
                     if self.puzzle.sudoku_puzzle[x][y] == 0:
                         if not self.puzzle.current_sudoku_puzzle[x][y] == self.puzzle.sudoku_completed[x][y]:
-                            num = self.grid_font.render(str(self.puzzle.current_sudoku_puzzle[x][y]), True, Colors.ImperialRed)
+                            num = self.glyphs.render(self.grid_font, str(self.puzzle.current_sudoku_puzzle[x][y]), True, Colors.ImperialRed)
                         else:
                             # Display right number in blue
-                            num = self.grid_font.render(str(self.puzzle.current_sudoku_puzzle[x][y]), True, Colors.Azure)
+                            num = self.glyphs.render(self.grid_font, str(self.puzzle.current_sudoku_puzzle[x][y]), True, Colors.Azure)
                     else:
                         # Display block number in Black
-                        num = self.grid_font.render(str(self.puzzle.current_sudoku_puzzle[x][y]), True, Colors.Black)
+                        num = self.glyphs.render(self.grid_font, str(self.puzzle.current_sudoku_puzzle[x][y]), True, Colors.Black)
                     # Draw the number with the appropriate color
                     self.window.blit(num,
                                      (self.GRID_PADDING[0] + self.CELL_SIZE//2 + x*self.CELL_SIZE - num.get_width()//2,
                                       self.GRID_PADDING[1] + self.CELL_SIZE//2 + y*self.CELL_SIZE - num.get_height()//3))
                 elif (x, y) in self.puzzle.markings:
                     for n in self.puzzle.markings[(x, y)]:
-                        num = self.small_font.render(str(n), True, Colors.IndigoDye)
+                        num = self.glyphs.render(self.small_font, str(n), True, Colors.IndigoDye)
                         self.window.blit(num, (self.grid.x + x * self.CELL_SIZE + (2 * ((n - 1) % 3 + 1) - 1) * self.CELL_SIZE // 6
                                                - num.get_width()//2,
                                                2 + self.grid.y + y * self.CELL_SIZE + (2 * ((n - 1) // 3) + 1) * self.CELL_SIZE // 6
                                                - num.get_height() // 2))
 
         # Small Pause Button
-        self.window.blit(self.small_pause_button[self.pause_toggle_rect.collidepoint(pygame.mouse.get_pos())],
+        self.window.blit(self.assets.get(self.small_pause_button[self.pause_toggle_rect.collidepoint(self.mouse_position)]),
                          (self.pause_toggle_rect.x, self.pause_toggle_rect.y))
 
-        # Drawing the buttons
-        if self.current_highlighted_number:
-            pygame.draw.rect(self.window, Colors.LightGray, self.current_highlighted_number)
-        pygame.draw.rect(self.window, Colors.Black, self.number_input_buttons_rect, 1)
-        for i in range(3):
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.number_input_buttons_rect.x + i * self.number_input_buttons_rect.width // 3,
-                              self.number_input_buttons_rect.y),
-                             (self.number_input_buttons_rect.x + i * self.number_input_buttons_rect.width // 3,
-                              self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.number_input_buttons_rect.x,
-                              self.number_input_buttons_rect.y + i * self.number_input_buttons_rect.width // 3),
-                             (self.number_input_buttons_rect.x + self.number_input_buttons_rect.width,
-                              self.number_input_buttons_rect.y + i * self.number_input_buttons_rect.width // 3))
-
-        if self.current_highlighted_button:
-            pygame.draw.rect(self.window, Colors.LightGray, self.current_highlighted_button)
-        # Undo button
-        self.window.blit(self.undo_button, (self.number_input_buttons_rect.x,
-                                            self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
-        pygame.draw.rect(self.window, Colors.Black, self.undo_button_rect, 1)
-
-        # Redo Button
-        self.window.blit(self.redo_button, (self.number_input_buttons_rect.x + 1 + self.number_input_buttons_rect.width//2,
-                                            self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
-        pygame.draw.rect(self.window, Colors.Black, self.redo_button_rect, 1)
-
-        # Mark Button
-        self.window.blit(self.marking_button, (self.marking_button_rect.x, self.marking_button_rect.y))
-        pygame.draw.rect(self.window, Colors.Black, self.marking_button_rect, 1)
-
-        # Erase Button
-        self.window.blit(self.erase_button, (self.erase_button_rect.x, self.erase_button_rect.y))
-        pygame.draw.rect(self.window, Colors.Black, self.erase_button_rect, 1)
-
-        # Restart Button
-        pygame.draw.rect(self.window, Colors.Azure, self.restart_button_rect)
-        pygame.draw.rect(self.window, Colors.IndigoDye, self.restart_button_rect, 1)
-
-        # New Game Button
-        pygame.draw.rect(self.window, Colors.ImperialRed, self.newgame_button_rect)
-        pygame.draw.rect(self.window, Colors.Black, self.newgame_button_rect, 1)
-
-        # Drawing numbers on the buttons
-        for i in range(3):
-            for j in range(3):
-                number = self.number_font.render(str(3 * i + j + 1), True, Colors.Black)
-                self.window.blit(number,
-                                 ((self.number_input_buttons_rect.x + (2 * j + 1) * self.number_input_buttons_rect.width // 6 -
-                                   number.get_width() // 2),
-                                  (self.number_input_buttons_rect.y + (2 * i + 1) * self.number_input_buttons_rect.width // 6 -
-                                   number.get_height() // 3)))
-        # Undo text
-        text = self.button_font.render("UNDO", True, Colors.Black)
-        self.window.blit(text, (self.undo_button_rect.x + self.undo_button.get_width()//2 - text.get_width()//2,
-                                self.undo_button_rect.y + 5*self.undo_button.get_height()//6 - text.get_height()//2 + 3))
-        # Redo text
-        text = self.button_font.render("REDO", True, Colors.Black)
-        self.window.blit(text, (self.redo_button_rect.x + 2 + self.redo_button.get_width() // 2 - text.get_width() // 2,
-                                self.redo_button_rect.y + 5 * self.undo_button.get_height() // 6 - text.get_height() // 2 + 3))
-
-        # Mark text
-        text = self.button_font.render("MARK", True, Colors.Black)
-        self.window.blit(text, (self.marking_button_rect.x + self.marking_button_rect.width//2 - text.get_width()//2,
-                                self.marking_button_rect.y + 5 * self.marking_button_rect.height//6 - text.get_height() // 2 + 3))
-        if self.puzzle.is_marking:
-            text = self.small_font.render("ON", True, Colors.White)
-            pygame.draw.ellipse(self.window, Colors.Azure, (self.marking_button_rect.x + 84 - text.get_width(),
-                                                            self.marking_button_rect.y + 48 - text.get_height(),
-                                                            2 * text.get_width(), 2 * text.get_height()))
-            self.window.blit(text, (self.marking_button_rect.x + 84 - text.get_width() // 2,
-                                    self.marking_button_rect.y + 48 - text.get_height() // 2))
-        else:
-            text = self.small_font.render("OFF", True, Colors.Black)
-            pygame.draw.ellipse(self.window, Colors.Gainsboro, (self.marking_button_rect.x + 84 - text.get_width(),
-                                                                self.marking_button_rect.y + 48 - text.get_height(),
-                                                                2 * text.get_width(), 2 * text.get_height()))
-            self.window.blit(text, (self.marking_button_rect.x + 84 - text.get_width() // 2,
-                                    self.marking_button_rect.y + 48 - text.get_height() // 2))
+        self._draw_marking_toggle()
 
         # Error calc
         self.error_deduction = self.error_count * self.error[self.difficulty]
 
-        # Erase text
-        text = self.button_font.render("ERASE", True, Colors.Black)
-        self.window.blit(text, (self.erase_button_rect.x + 2 + self.erase_button_rect.width // 2 - text.get_width() // 2,
-                                self.erase_button_rect.y + 5 * self.erase_button_rect.height // 6 - text.get_height() // 2 + 3))
-
-        # Restart Text
-        text = self.button_font2.render("RESTART", True, Colors.White)
-        self.window.blit(text, (self.restart_button_rect.x + self.restart_button_rect.width//2 - text.get_width()//2,
-                                self.restart_button_rect.y + self.restart_button_rect.height//2 - text.get_height()//2 + 2))
-
-        # Newgame Text
-        text = self.button_font2.render("NEW GAME", True, Colors.White)
-        self.window.blit(text, (self.newgame_button_rect.x + self.newgame_button_rect.width // 2 - text.get_width() // 2,
-                                self.newgame_button_rect.y + self.newgame_button_rect.height // 2 - text.get_height() // 2 + 2))
-
         # Progress Bar
-        pygame.draw.rect(self.window, Colors.Black, self.progress_bar_rect, 2)
-        pygame.draw.line(self.window, Colors.Gainsboro, (self.progress_bar_rect.x + 2, self.progress_bar_rect.y + 3),
-                         (self.progress_bar_rect.x + self.progress_bar_rect.width - 2,
-                          self.progress_bar_rect.y + 3), 1)
-        pygame.draw.line(self.window, Colors.Gainsboro, (self.progress_bar_rect.x + 2, self.progress_bar_rect.y - 3 + 25),
-                         (self.progress_bar_rect.x + self.progress_bar_rect.width - 2,
-                          self.progress_bar_rect.y + 25 - 3), 1)
-        self.current_progress = self.current_progress + (self.puzzle.get_percentage_completion() - self.current_progress)/25
-        pygame.draw.rect(self.window, Colors.Azure, (self.progress_bar_rect.x + 4, self.progress_bar_rect.y + 5,
-                                                     int(self.current_progress*(self.progress_bar_rect.width-6)) // 100, 25 - 8))
-        text = self.small_font.render("COMPLETION: {0}%".format(trunc(self.puzzle.get_percentage_completion())),
-                                      True, Colors.Azure)
-        self.window.blit(text, (self.progress_bar_rect.x,
-                                self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
+        self._draw_progress()
 
         if self.alert_timer > 0:
-            text = self.small_font.render("NO CELL SELECTED!", True, Colors.ImperialRed)
+            text = self.glyphs.render(self.small_font, "NO CELL SELECTED!", True, Colors.ImperialRed)
+            self.window.blit(text, (self.progress_bar_rect.x + self.progress_bar_rect.width - text.get_width(),
+                                    self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
+        elif self.completion_message_timer > 0:
+            text = self.glyphs.render(self.small_font, self.completion_message, True, Colors.Azure)
             self.window.blit(text, (self.progress_bar_rect.x + self.progress_bar_rect.width - text.get_width(),
                                     self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
-            self.alert_timer -= 5
 
         # Timer
         if not self.start_time == 0:
-            text = self.timer_font.render("TIME ELAPSED:  {3}:{2}:{1}:{0}".format(str(int((self.play_time * 100) % 100)).zfill(2),
-                                                                                  str(int(self.play_time) % 60).zfill(2),
-                                                                                  str(int(self.play_time) // 60).zfill(2),
-                                                                                  str(int(self.play_time) // 3600).zfill(2)),
-                                          True, Colors.Azure)
+            text = self.glyphs.render(self.timer_font, "TIME ELAPSED:  {3}:{2}:{1}:{0}".format(str(int((self.play_time * 100) % 100)).zfill(2),
+                                                                                               str(int(self.play_time) % 60).zfill(2),
+                                                                                               str(int(self.play_time) // 60).zfill(2),
+                                                                                               str(int(self.play_time) // 3600).zfill(2)),
+                                                       True, Colors.Azure)
             # Decrement bonus
             self.current_bonus = (self.bonus[self.difficulty]) - ((int(self.play_time * 100) % 100) * 0.2)
         else:
-            text = self.timer_font.render("TIME ELAPSED:  00:00:00:00", True, Colors.Azure)
+            text = self.glyphs.render(self.timer_font, "TIME ELAPSED:  00:00:00:00", True, Colors.Azure)
             self.current_bonus = self.bonus[self.difficulty]
             self.error_count = 0
             self.error_deduction = 0
@@ -733,13 +1094,13 @@ class Game:
                                 self.pause_toggle_rect.y + self.pause_toggle_rect.height // 2 - text.get_height() // 2))
 
         # Score
-        self.score = int(self.puzzle.get_percentage_completion() * self.diff_points[self.difficulty] // 100)
-        text = self.small_font.render(f"SCORE: {self.score}", True, Colors.Black)
+        self.score = int(self.completion_percentage * self.diff_points[self.difficulty] // 100)
+        text = self.glyphs.render(self.small_font, f"SCORE: {self.score}", True, Colors.Black)
         self.window.blit(text, (self.grid.x,
                                 self.grid.y - text.get_height() - 2))
 
         # Errors
-        text = self.small_font.render(f"ERROR COUNT: {self.error_count}", True, Colors.Black)
+        text = self.glyphs.render(self.small_font, f"ERROR COUNT: {self.error_count}", True, Colors.Black)
         self.window.blit(text, (self.grid.x + self.grid.width - text.get_width(),
                                 self.grid.y - text.get_height() - 2))
 
@@ -752,165 +1113,42 @@ class Game:
         Handles all the drawing activites in the Paused State
         :return: None
         """
-        self.window.blit(self.sudoku_bg, (0, 0))
-        pygame.draw.rect(self.window, Colors.White, self.grid)
-        pygame.draw.rect(self.window, Colors.White, self.number_input_buttons_rect)
-        pygame.draw.rect(self.window, Colors.White, self.progress_bar_rect)
-        pygame.draw.rect(self.window, Colors.White, (self.undo_button_rect.x, self.undo_button_rect.y,
-                                                     self.number_input_buttons_rect.width, self.number_input_buttons_rect.height))
-
-        self.pause_time = time.time() - self.pause_start_time
-        # Drawing an empty grid for preventing player from watching it when paused
-        for i in range(10):
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.GRID_PADDING[0] + (i * self.CELL_SIZE), self.GRID_PADDING[1]),
-                             (self.GRID_PADDING[0] + (i * self.CELL_SIZE), self.GRID_PADDING[1] + (9 * self.CELL_SIZE)),
-                             (i % 3 == 0) + 1)
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.GRID_PADDING[0], self.GRID_PADDING[1] + (i * self.CELL_SIZE)),
-                             (self.GRID_PADDING[0] + (9 * self.CELL_SIZE), self.GRID_PADDING[1] + (i * self.CELL_SIZE)),
-                             (i % 3 == 0) + 1)
-
-        # Big play button in the center of the grid
-        self.window.blit(self.big_play_button, (self.GRID_PADDING[0] + 9*self.CELL_SIZE//2 - 37,
-                                                self.GRID_PADDING[1] + 9*self.CELL_SIZE//2 - 37))
+        background, foreground = self._get_static_layers()
+        self.window.blit(background, (0, 0))
 
         # Small play button at the top-left
-        self.window.blit(self.small_play_button[self.pause_toggle_rect.collidepoint(pygame.mouse.get_pos())],
+        self.window.blit(self.assets.get(self.small_play_button[self.pause_toggle_rect.collidepoint(self.mouse_position)]),
                          (self.pause_toggle_rect.x, self.pause_toggle_rect.y))
 
-        # Drawing the buttons
+        # Highlighted buttons
         if self.current_highlighted_number:
             pygame.draw.rect(self.window, Colors.LightGray, self.current_highlighted_number)
-        pygame.draw.rect(self.window, Colors.Black, self.number_input_buttons_rect, 1)
-        for i in range(3):
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.number_input_buttons_rect.x + i * self.number_input_buttons_rect.width // 3,
-                              self.number_input_buttons_rect.y),
-                             (self.number_input_buttons_rect.x + i * self.number_input_buttons_rect.width // 3,
-                              self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
-            pygame.draw.line(self.window, Colors.Black,
-                             (self.number_input_buttons_rect.x,
-                              self.number_input_buttons_rect.y + i * self.number_input_buttons_rect.width // 3),
-                             (self.number_input_buttons_rect.x + self.number_input_buttons_rect.width,
-                              self.number_input_buttons_rect.y + i * self.number_input_buttons_rect.width // 3))
-
         if self.current_highlighted_button:
             pygame.draw.rect(self.window, Colors.LightGray, self.current_highlighted_button)
-        # Undo button
-        self.window.blit(self.undo_button, (self.number_input_buttons_rect.x,
-                                            self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
-        pygame.draw.rect(self.window, Colors.Black, self.undo_button_rect, 1)
-        # Redo Button
-        self.window.blit(self.redo_button, (self.number_input_buttons_rect.x + 1 + self.number_input_buttons_rect.width//2,
-                                            self.number_input_buttons_rect.y + self.number_input_buttons_rect.height))
-        pygame.draw.rect(self.window, Colors.Black, self.redo_button_rect, 1)
-
-        # Mark Button
-        self.window.blit(self.marking_button, (self.marking_button_rect.x, self.marking_button_rect.y))
-        pygame.draw.rect(self.window, Colors.Black, self.marking_button_rect, 1)
-
-        # Erase Button
-        self.window.blit(self.erase_button, (self.erase_button_rect.x, self.erase_button_rect.y))
-        pygame.draw.rect(self.window, Colors.Black, self.erase_button_rect, 1)
-
-        # Restart Button
-        pygame.draw.rect(self.window, Colors.Azure, self.restart_button_rect)
-        pygame.draw.rect(self.window, Colors.IndigoDye, self.restart_button_rect, 1)
-
-        # New Game Button
-        pygame.draw.rect(self.window, Colors.ImperialRed, self.newgame_button_rect)
-        pygame.draw.rect(self.window, Colors.Black, self.newgame_button_rect, 1)
 
-        # Drawing numbers on the buttons
-        for i in range(3):
-            for j in range(3):
-                number = self.number_font.render(str(3 * i + j + 1), True, Colors.Black)
-                self.window.blit(number,
-                                 ((self.number_input_buttons_rect.x + (2 * j + 1) * self.number_input_buttons_rect.width // 6 -
-                                   number.get_width() // 2),
-                                  (self.number_input_buttons_rect.y + (2 * i + 1) * self.number_input_buttons_rect.width // 6 -
-                                   number.get_height() // 3)))
+        # The buttons go over the highlights
+        self.window.blit(foreground, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
 
-        # Undo text
-        text = self.button_font.render("UNDO", True, Colors.Black)
-        self.window.blit(text, (self.undo_button_rect.x + self.undo_button.get_width() // 2 - text.get_width() // 2,
-                                self.undo_button_rect.y + 5 * self.undo_button.get_height() // 6 - text.get_height() // 2 + 3))
-        # Redo text
-        text = self.button_font.render("REDO", True, Colors.Black)
-        self.window.blit(text, (self.redo_button_rect.x + 2 + self.redo_button.get_width() // 2 - text.get_width() // 2,
-                                self.redo_button_rect.y + 5 * self.undo_button.get_height() // 6 - text.get_height() // 2 + 3))
-
-        # Mark text
-        text = self.button_font.render("MARK", True, Colors.Black)
-        self.window.blit(text, (self.marking_button_rect.x + self.marking_button_rect.width // 2 - text.get_width() // 2,
-                                self.marking_button_rect.y + 5 * self.marking_button_rect.height // 6 - text.get_height() // 2 + 3))
-        if self.puzzle.is_marking:
-            text = self.small_font.render("ON", True, Colors.White)
-            pygame.draw.ellipse(self.window, Colors.Azure, (self.marking_button_rect.x + 84 - text.get_width(),
-                                                            self.marking_button_rect.y + 48 - text.get_height(),
-                                                            2 * text.get_width(), 2 * text.get_height()))
-            self.window.blit(text, (self.marking_button_rect.x + 84 - text.get_width() // 2,
-                                    self.marking_button_rect.y + 48 - text.get_height() // 2))
-        else:
-            text = self.small_font.render("OFF", True, Colors.Black)
-            pygame.draw.ellipse(self.window, Colors.Gainsboro, (self.marking_button_rect.x + 84 - text.get_width(),
-                                                                self.marking_button_rect.y + 48 - text.get_height(),
-                                                                2 * text.get_width(), 2 * text.get_height()))
-            self.window.blit(text, (self.marking_button_rect.x + 84 - text.get_width() // 2,
-                                    self.marking_button_rect.y + 48 - text.get_height() // 2))
-
-        # Erase text
-        text = self.button_font.render("ERASE", True, Colors.Black)
-        self.window.blit(text, (self.erase_button_rect.x + 2 + self.erase_button_rect.width // 2 - text.get_width() // 2,
-                                self.erase_button_rect.y + 5 * self.erase_button_rect.height // 6 - text.get_height() // 2 + 3))
-
-        # Restart Text
-        text = self.button_font2.render("RESTART", True, Colors.White)
-        self.window.blit(text, (self.restart_button_rect.x + self.restart_button_rect.width//2 - text.get_width()//2,
-                                self.restart_button_rect.y + self.restart_button_rect.height//2 - text.get_height()//2 + 2))
-
-        # Newgame Text
-        text = self.button_font2.render("NEW GAME", True, Colors.White)
-        self.window.blit(text, (self.newgame_button_rect.x + self.newgame_button_rect.width // 2 - text.get_width() // 2,
-                                self.newgame_button_rect.y + self.newgame_button_rect.height // 2 - text.get_height() // 2 + 2))
+        self._draw_marking_toggle()
 
         # Progress Bar
-        pygame.draw.rect(self.window, Colors.Black, self.progress_bar_rect, 2)
-        pygame.draw.line(self.window, Colors.Gainsboro, (self.progress_bar_rect.x + 2, self.progress_bar_rect.y + 3),
-                         (self.progress_bar_rect.x + self.progress_bar_rect.width - 2,
-                          self.progress_bar_rect.y + 3), 1)
-        pygame.draw.line(self.window, Colors.Gainsboro, (self.progress_bar_rect.x + 2, self.progress_bar_rect.y - 3 + 25),
-                         (self.progress_bar_rect.x + self.progress_bar_rect.width - 2,
-                          self.progress_bar_rect.y + 25 - 3), 1)
-        self.current_progress = self.current_progress + (self.puzzle.get_percentage_completion() - self.current_progress) / 100
-        pygame.draw.rect(self.window, Colors.Azure, (self.progress_bar_rect.x + 4, self.progress_bar_rect.y + 5,
-                                                     int(self.current_progress * (self.progress_bar_rect.width - 6)) // 100, 25 - 8))
-        text = self.small_font.render("COMPLETION: {0}%".format(trunc(self.puzzle.get_percentage_completion())),
-                                      True, Colors.Azure)
-        self.window.blit(text, (self.progress_bar_rect.x,
-                                self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
+        self._draw_progress()
 
         # Timer
         if not self.not_ticking:
-            text = self.timer_font.render("TIME ELAPSED:  {3}:{2}:{1}:{0}".format(str(int((self.play_time * 100) % 100)).zfill(2),
-                                                                                  str(int(self.play_time) % 60).zfill(2),
-                                                                                  str(int(self.play_time) // 60).zfill(2),
-                                                                                  str(int(self.play_time) // 3600).zfill(2)),
-                                          True, Colors.Azure)
+            text = self.glyphs.render(self.timer_font, "TIME ELAPSED:  {3}:{2}:{1}:{0}".format(str(int((self.play_time * 100) % 100)).zfill(2),
+                                                                                               str(int(self.play_time) % 60).zfill(2),
+                                                                                               str(int(self.play_time) // 60).zfill(2),
+                                                                                               str(int(self.play_time) // 3600).zfill(2)),
+                                                       True, Colors.Azure)
         else:
-            text = self.timer_font.render("TIME ELAPSED:  00:00:00:00", True, Colors.Azure)
+            text = self.glyphs.render(self.timer_font, "TIME ELAPSED:  00:00:00:00", True, Colors.Azure)
         self.window.blit(text, (self.pause_toggle_rect.x - 10 * text.get_width() // 9,
                                 self.pause_toggle_rect.y + self.pause_toggle_rect.height // 2 - text.get_height() // 2))
 
-        # Paused Message
-        text = self.small_font.render("GAME PAUSED!", True, Colors.ImperialRed)
-        self.window.blit(text, (self.progress_bar_rect.x + self.progress_bar_rect.width - text.get_width(),
-                                self.progress_bar_rect.y + self.progress_bar_rect.height + 5))
-
         # Score
-        self.score = int(self.puzzle.get_percentage_completion() * 2500 // 100)
-        text = self.small_font.render(f"SCORE: {self.score}", True, Colors.Black)
+        self.score = int(self.completion_percentage * 2500 // 100)
+        text = self.glyphs.render(self.small_font, f"SCORE: {self.score}", True, Colors.Black)
         self.window.blit(text, (self.grid.x,
                                 self.grid.y - text.get_height() - 2))
 
@@ -919,66 +1157,101 @@ class Game:
         Handles all the drawing activites in the Scores state
         :return: None
         """
-        self.window.blit(self.sudoku_bg, (0, 0))
+        self.window.blit(self._get_static_layers()[0], (0, 0))
         total_score = self.score + self.current_bonus - self.error_deduction
 
-        text = self.heading_font.render("CONGRATULATIONS! PUZZLE COMPLETED!!", True, Colors.IndigoDye)
-        self.window.blit(text, (self.WIDTH // 2 - text.get_width() // 2 - 2, self.HEIGHT // 8 - text.get_height() // 2 + 2))
-        text = self.heading_font.render("CONGRATULATIONS! PUZZLE COMPLETED!!", True, Colors.Azure)
-        self.window.blit(text, (self.WIDTH//2 - text.get_width()//2, self.HEIGHT//8 - text.get_height()//2))
-
-        text = self.button_font2.render("COMPLETION TIME :  {3}:{2}:{1}:{0}".format(str(int((self.play_time * 100) % 100)).zfill(2),
-                                                                                    str(int(self.play_time) % 60).zfill(2),
-                                                                                    str(int(self.play_time) // 60).zfill(2),
-                                                                                    str(int(self.play_time) // 3600).zfill(2)),
-                                        True, Colors.Black)
+        text = self.glyphs.render(self.button_font2, "COMPLETION TIME :  {3}:{2}:{1}:{0}".format(str(int((self.play_time * 100) % 100)).zfill(2),
+                                                                                                 str(int(self.play_time) % 60).zfill(2),
+                                                                                                 str(int(self.play_time) // 60).zfill(2),
+                                                                                                 str(int(self.play_time) // 3600).zfill(2)),
+                                                     True, Colors.Black)
         self.window.blit(text, (self.WIDTH // 2 - text.get_width() // 2, self.HEIGHT // 2 - 5 * text.get_height() // 2 - 2*text.get_height()))
 
-        # Particulars
-        text = self.button_font2.render("COMPLETION SCORE :", True, Colors.Black)
-        self.window.blit(text, (self.WIDTH//5, self.HEIGHT//2 - 3*text.get_height() // 2 - text.get_height()))
-        text = self.button_font2.render("BONUS SCORE :", True, Colors.Black)
-        self.window.blit(text, (self.WIDTH // 5, self.HEIGHT // 2 - text.get_height() // 2 - text.get_height()))
-        text = self.button_font2.render("ERRORS :", True, Colors.Black)
-        self.window.blit(text, (self.WIDTH // 5, self.HEIGHT // 2 + text.get_height() // 2 - text.get_height()))
-
-        pygame.draw.line(self.window, Colors.Black, (self.WIDTH//5, self.HEIGHT//2 + text.get_height()),
-                         (4*self.WIDTH//5, self.HEIGHT//2 + text.get_height()), 2)
-
-        text = self.button_font2.render("TOTAL SCORE :", True, Colors.ImperialRed)
-        self.window.blit(text, (self.WIDTH // 5, self.HEIGHT // 2 + 2*text.get_height()))
-
         # Values
         self.current_bonus = max(0.0, self.current_bonus)
-        text = self.button_font2.render("+ %.2f" % self.score, True, Colors.Black)
+        text = self.glyphs.render(self.button_font2, "+ %.2f" % self.score, True, Colors.Black)
         self.window.blit(text, (4 * self.WIDTH // 5 - text.get_width(), self.HEIGHT // 2 - 3 * text.get_height() // 2 - text.get_height()))
-        text = self.button_font2.render("+ %.2f" % self.current_bonus, True, Colors.Black)
+        text = self.glyphs.render(self.button_font2, "+ %.2f" % self.current_bonus, True, Colors.Black)
         self.window.blit(text, (4 * self.WIDTH // 5 - text.get_width(), self.HEIGHT // 2 - text.get_height() // 2 - text.get_height()))
-        text = self.button_font2.render("- %.2f" % self.error_deduction, True, Colors.Black)
+        text = self.glyphs.render(self.button_font2, "- %.2f" % self.error_deduction, True, Colors.Black)
         self.window.blit(text, (4 * self.WIDTH // 5 - text.get_width(), self.HEIGHT // 2 + text.get_height() // 2 - text.get_height()))
 
-        text = self.button_font2.render("%.2f" % total_score, True, Colors.ImperialRed)
+        text = self.glyphs.render(self.button_font2, "%.2f" % total_score, True, Colors.ImperialRed)
         self.window.blit(text, (4 * self.WIDTH // 5 - text.get_width(), self.HEIGHT // 2 + 2 * text.get_height()))
 
         # Buttons
-        if self.home_button.collidepoint(pygame.mouse.get_pos()):
+        if self.home_button.collidepoint(self.mouse_position):
             pygame.draw.rect(self.window, Colors.BabyBlue, self.home_button)
         else:
             pygame.draw.rect(self.window, Colors.Azure, self.home_button)
         pygame.draw.rect(self.window, Colors.Black, self.home_button, 2)
-        text = self.button_font2.render("HOME", True, Colors.White)
+        text = self.glyphs.render(self.button_font2, "HOME", True, Colors.White)
         self.window.blit(text, (self.home_button.x + self.home_button.width // 2 - text.get_width() // 2,
                                 self.home_button.y + self.home_button.height // 2 - text.get_height() // 2))
 
-        if self.exit_button.collidepoint(pygame.mouse.get_pos()):
+        if self.exit_button.collidepoint(self.mouse_position):
             pygame.draw.rect(self.window, Colors.LightCoral, self.exit_button)
         else:
             pygame.draw.rect(self.window, Colors.ImperialRed, self.exit_button)
         pygame.draw.rect(self.window, Colors.Black, self.exit_button, 2)
-        text = self.button_font2.render("EXIT", True, Colors.White)
+        text = self.glyphs.render(self.button_font2, "EXIT", True, Colors.White)
         self.window.blit(text, (self.exit_button.x + self.exit_button.width // 2 - text.get_width() // 2,
                                 self.exit_button.y + self.exit_button.height // 2 - text.get_height() // 2))
 
+    def _run_frame(self, events, seconds):
+        """
+        Handles the events of a frame, advances the game by the seconds passed and draws the frame
+        :param events: List[pygame.event.Event]
+        :param seconds: float
+        :return: bool (False once the game is quit)
+        """
+        profiler = self.profiler
+        start = time.perf_counter()
+        with profiler.measure("events"):
+            running = self._handle_events(events)
+
+        # Handling states
+        with profiler.measure("state"):
+            self._update_state_function()
+            self._update_timers(seconds)
+
+        # Only redraw the damaged part of the window, and only send the damaged regions to the display
+        with profiler.measure("damage"):
+            damaged = self.damage.update(self.state, self._get_damage_regions())
+        self.window.set_clip(self.damage.get_clip(damaged))
+        with profiler.measure(f"draw {self.state.name}"):
+            self.window.fill(Colors.White)
+            self.state_function()
+        if self.show_profiler and self.window.get_clip().colliderect(self._get_profiler_rect()):
+            with profiler.measure("overlay"):
+                profiler.draw(self.window, self.PROFILER_POSITION, self.profiler_font)
+        self.window.set_clip(None)
+
+        # Update the frame
+        with profiler.measure("display"):
+            if damaged:
+                pygame.display.update(damaged)
+        profiler.record("frame", time.perf_counter() - start)
+
+        # Once the Intro screen is up, the rest of the images are loaded before they are needed
+        if self.damage.frames == 1:
+            profiler.record("first frame", time.perf_counter() - self.launch_time)
+            self.assets.load_all()
+
+        return running
+
+    def _quit(self):
+        """
+        Shuts down the puzzle generators and pygame
+        :return: None
+        """
+        if self.generation_job:
+            self.generation_job.cancel()
+        self.puzzle_pool.close()
+        if self.puzzle_bank:
+            self.puzzle_bank.close()
+        pygame.quit()
+
     def _draw(self):
         """
         Handles all the master drawing states
@@ -986,17 +1259,16 @@ class Game:
         """
         running = True
 
-        while running:
-            self.window.fill(Colors.White)
-            running = self._handle_events()
+        idle = False
 
-            # Handling states
-            self._update_state_function()
-            self.state_function()
+        while running:
+            # Wait for the frame rate cap, or for an event when nothing is moving
+            events, seconds = self.scheduler.next_frame(idle)
+            running = self._run_frame(events, seconds)
+            idle = self._is_idle()
 
-            # Update the frame
-            pygame.display.update()
+        self._quit()
 
-        pygame.quit()
 
-Game()
+if __name__ == "__main__":
+    Game()
@@ -0,0 +1,99 @@
+"""
+This file consists of a command line tool that generates sudoku puzzles in bulk,
+spread over a pool of worker processes.
+
+Every finished puzzle is written as one line: the difficulty, the puzzle and its solution,
+separated by spaces, with the boards written as 81 characters ("." for empty positions).
+
+Example:
+    python SudokuGenerate.py --count 1000 --difficulty expert --jobs 4 --output expert.txt
+"""
+
+# Imports
+import argparse
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+from Sudoku import Difficulty, SOLVER_BACKENDS, Solver, board_to_string
+from SudokuStats import format_latencies
+
+# Difficulties that can be chosen on the command line
+DIFFICULTIES = {"easy": Difficulty.Easy,
+                "medium": Difficulty.Medium,
+                "hard": Difficulty.Hard,
+                "expert": Difficulty.Expert}
+
+
+def generate_line(difficulty, backend):
+    """
+    Generates a puzzle in a worker process
+    :param difficulty: int
+    :param backend: str
+    :return: Tuple[int, str, float] (difficulty, output line, seconds taken)
+    """
+
+    start = time.perf_counter()
+    completed, puzzle = Solver(backend).generate_puzzle(difficulty)
+    line = f"{difficulty} {board_to_string(puzzle)} {board_to_string(completed)}\n"
+    return difficulty, line, time.perf_counter() - start
+
+
+def parse_arguments(arguments=None):
+    """
+    Parses the command line arguments
+    :param arguments: List[str]
+    :return: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(description="Generate sudoku puzzles in bulk.")
+    parser.add_argument("-n", "--count", type=int, default=100,
+                        help="number of puzzles to generate for each difficulty (default: 100)")
+    parser.add_argument("-d", "--difficulty", action="append", choices=DIFFICULTIES,
+                        help="difficulty to generate, can be repeated (default: all of them)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to write the puzzles to (default: standard output)")
+    parser.add_argument("--backend", choices=SOLVER_BACKENDS, default="backtracking",
+                        help="solver used to generate the puzzles (default: backtracking)")
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    """
+    Generates the puzzles and prints the throughput and latency statistics
+    :param arguments: List[str]
+    :return: None
+    """
+
+    arguments = parse_arguments(arguments)
+    difficulties = [DIFFICULTIES[name] for name in arguments.difficulty or DIFFICULTIES]
+    tasks = (difficulty for difficulty in difficulties for _ in range(arguments.count))
+    latencies = {difficulty: [] for difficulty in difficulties}
+
+    output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+    start = time.perf_counter()
+    try:
+        with Pool(arguments.jobs) as pool:
+            # Puzzles are written in the order they finish, so none of them are kept in memory
+            for difficulty, line, seconds in pool.imap_unordered(partial(generate_line, backend=arguments.backend),
+                                                                 tasks, chunksize=4):
+                output.write(line)
+                latencies[difficulty].append(seconds)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"Generated {total} puzzles in {elapsed:.2f}s with {arguments.jobs} jobs "
+          f"({total / elapsed:.1f} puzzles/sec)", file=sys.stderr)
+    for name, difficulty in DIFFICULTIES.items():
+        if difficulty in latencies:
+            print(f"  {name:<6} {format_latencies(latencies[difficulty])}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+This file consists of the headless mode of the game, which replays a stream of input events through
+the game under SDL's dummy video driver, as fast as it can, and reports how long the frames took in
+every state. Input handling and drawing regressions can be measured this way without a display.
+
+An event stream is a file with one frame per line, in JSON, holding the seconds the frame advances
+the game by and the events of the frame:
+    {"seconds": 0.0167, "events": [{"type": "MOUSEBUTTONDOWN", "pos": [600, 412], "button": 1}]}
+
+Without a file, a scripted stream is played: it picks the expert difficulty, fills every cell from
+the number buttons, undoes and redoes with the buttons and the keyboard, pencil marks and erases
+cells, and pauses the game.
+
+Examples:
+    python SudokuHeadless.py
+    python SudokuHeadless.py record session.jsonl
+    python SudokuHeadless.py replay session.jsonl
+    python SudokuHeadless.py --profile profile.csv
+"""
+
+# Imports
+import argparse
+import json
+import os
+import sys
+import time
+import pygame
+from SudokuGame import Game, State
+from SudokuStats import format_latencies
+
+# Events of these types are recorded and replayed, the game does not use any other
+EVENT_TYPES = ("QUIT", "MOUSEMOTION", "MOUSEBUTTONDOWN", "MOUSEBUTTONUP", "KEYDOWN", "KEYUP")
+
+
+def event_to_dict(event):
+    """
+    Writes a pygame event as a dictionary of its type name and attributes
+    :param event: pygame.event.Event
+    :return: Dict[str, Any]
+    """
+
+    attributes = {name: list(value) if isinstance(value, tuple) else value
+                  for name, value in event.dict.items() if isinstance(value, (int, float, str, tuple))}
+    return {"type": pygame.event.event_name(event.type).upper(), **attributes}
+
+
+def dict_to_event(attributes):
+    """
+    Reads a pygame event from a dictionary written by event_to_dict
+    :param attributes: Dict[str, Any]
+    :return: pygame.event.Event
+    """
+
+    attributes = dict(attributes)
+    event_type = getattr(pygame, attributes.pop("type"))
+    return pygame.event.Event(event_type, {name: tuple(value) if isinstance(value, list) else value
+                                           for name, value in attributes.items()})
+
+
+def read_frames(path):
+    """
+    Reads the frames of an event stream file
+    :param path: str
+    :return: List[Tuple[float, List[pygame.event.Event]]]
+    """
+
+    frames = []
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                frame = json.loads(line)
+                frames.append((frame["seconds"], [dict_to_event(event) for event in frame["events"]]))
+    return frames
+
+
+def make_script(game):
+    """
+    Makes the scripted event stream, with the positions of the buttons of the game
+    :param game: Game
+    :return: List[Tuple[float, List[pygame.event.Event]]]
+    """
+
+    frames = []
+    seconds = 1 / game.FPS
+
+    def wait(count=1):
+        frames.extend((seconds, []) for _ in range(count))
+
+    def move(position):
+        frames.append((seconds, [pygame.event.Event(pygame.MOUSEMOTION, pos=position, rel=(0, 0),
+                                                    buttons=(0, 0, 0))]))
+
+    def click(position):
+        move(position)
+        frames.append((seconds, [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=position, button=1)]))
+        frames.append((seconds, [pygame.event.Event(pygame.MOUSEBUTTONUP, pos=position, button=1)]))
+        wait()
+
+    def press(key, mod=0):
+        frames.append((seconds, [pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod, unicode="")]))
+        frames.append((seconds, [pygame.event.Event(pygame.KEYUP, key=key, mod=mod, unicode="")]))
+        wait()
+
+    def cell(x, y):
+        return (game.grid.x + x * game.CELL_SIZE + game.CELL_SIZE // 2,
+                game.grid.y + y * game.CELL_SIZE + game.CELL_SIZE // 2)
+
+    def number_button(n):
+        size = game.number_input_buttons_rect.width // 3
+        return (game.number_input_buttons_rect.x + (n - 1) % 3 * size + size // 2,
+                game.number_input_buttons_rect.y + (n - 1) // 3 * size + size // 2)
+
+    # Intro, with the text blinking
+    wait(int(game.FPS * game.INTRO_BLINK_PERIOD))
+    click((game.WIDTH // 2, game.HEIGHT // 2))
+
+    # Difficulty selection, hovering over every box before picking the expert one
+    for box in (game.easy_box_rect, game.medium_box_rect, game.hard_box_rect, game.expert_box_rect):
+        move(box.center)
+        wait(2)
+    click(game.expert_box_rect.center)
+
+    # Filling every cell from the number buttons
+    for y in range(9):
+        for x in range(9):
+            click(cell(x, y))
+            click(number_button((x + y) % 9 + 1))
+
+    # Undoing and redoing, with the buttons and the keyboard
+    for _ in range(10):
+        click(game.undo_button_rect.center)
+    for _ in range(5):
+        click(game.redo_button_rect.center)
+    for _ in range(5):
+        press(pygame.K_z, pygame.KMOD_LCTRL)
+    for _ in range(5):
+        press(pygame.K_r, pygame.KMOD_LCTRL)
+
+    # Pencil marks in a row, then erasing them
+    click(game.marking_button_rect.center)
+    for x in range(9):
+        click(cell(x, 4))
+        for n in range(1, 10, 2):
+            click(number_button(n))
+    click(game.marking_button_rect.center)
+    for x in range(9):
+        click(cell(x, 4))
+        click(game.erase_button_rect.center)
+
+    # Pausing while the progress bar settles
+    click(game.pause_toggle_rect.center)
+    wait(game.FPS)
+    click(game.grid.center)
+    wait(game.FPS)
+
+    frames.append((seconds, [pygame.event.Event(pygame.QUIT)]))
+    return frames
+
+
+class HeadlessGame(Game):
+    """
+    This is the game with its frames driven by an event stream instead of the display, timing every frame
+    """
+    def __init__(self, frames=None, fps=60):
+        """
+        Sets up the game and plays the event stream, or the scripted stream if there is none
+        :param frames: List[Tuple[float, List[pygame.event.Event]]]
+        :param fps: int (frame rate the scripted stream is made for)
+        """
+
+        self.frames = frames
+        self.frame_times = {state: [] for state in State}
+        super().__init__(fps)
+
+    def _draw(self):
+        """
+        Plays the frames of the event stream as fast as possible
+        :return: None
+        """
+
+        if self.frames is None:
+            self.frames = make_script(self)
+
+        for seconds, events in self.frames:
+            start = time.perf_counter()
+            running = self._run_frame(events, seconds)
+            self.frame_times[self.state].append(time.perf_counter() - start)
+            if not running:
+                break
+
+        self._quit()
+
+
+class RecordingGame(Game):
+    """
+    This is the game played on the display, writing the events of every frame to an event stream file
+    """
+    def __init__(self, path, fps=60):
+        """
+        Sets up the game and runs it until the window is closed, recording the events
+        :param path: str
+        :param fps: int
+        """
+
+        self.recording = open(path, "w")
+        try:
+            super().__init__(fps)
+        finally:
+            self.recording.close()
+
+    def _run_frame(self, events, seconds):
+        """
+        Records the events of the frame before running it
+        :param events: List[pygame.event.Event]
+        :param seconds: float
+        :return: bool
+        """
+
+        recorded = [event_to_dict(event) for event in events
+                    if pygame.event.event_name(event.type).upper() in EVENT_TYPES]
+        self.recording.write(json.dumps({"seconds": round(seconds, 4), "events": recorded}) + "\n")
+        return super()._run_frame(events, seconds)
+
+
+def main(arguments=None):
+    """
+    Replays an event stream headless and prints the frame times of every state, or records one
+    :param arguments: List[str]
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Replay input through the game without a display "
+                                                 "and time the frames.")
+    parser.add_argument("--fps", type=int, default=60, help="frame rate of the scripted stream (default: 60)")
+    parser.add_argument("--profile", help="file to write the profiler timings to, as JSON or as CSV if it ends "
+                                          "with .csv")
+    # The commands accept the options too, and only set them when they are given, so an option given
+    # before the command is not overridden by the command's default
+    fps_option = argparse.ArgumentParser(add_help=False)
+    fps_option.add_argument("--fps", type=int, default=argparse.SUPPRESS,
+                            help="frame rate of the scripted stream (default: 60)")
+    profile_option = argparse.ArgumentParser(add_help=False)
+    profile_option.add_argument("--profile", default=argparse.SUPPRESS,
+                                help="file to write the profiler timings to, as JSON or as CSV if it ends "
+                                     "with .csv")
+    commands = parser.add_subparsers(dest="command")
+    replay = commands.add_parser("replay", help="replay an event stream, the default command",
+                                 parents=[fps_option, profile_option])
+    replay.add_argument("stream", nargs="?", help="event stream file (default: the scripted stream)")
+    record = commands.add_parser("record", help="play the game on the display and record its events",
+                                 parents=[fps_option])
+    record.add_argument("stream", help="event stream file to write")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == "record":
+        RecordingGame(arguments.stream, arguments.fps)
+        return
+
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    frames = read_frames(arguments.stream) if getattr(arguments, "stream", None) else None
+
+    start = time.perf_counter()
+    game = HeadlessGame(frames, arguments.fps)
+    elapsed = time.perf_counter() - start
+
+    played = sum(len(times) for times in game.frame_times.values())
+    first_frame = game.profiler.histograms.get("first frame")
+    if first_frame is not None:
+        print(f"First frame drawn {first_frame.total * 1000:.0f} ms after start", file=sys.stderr)
+    print(f"Redrew {game.damage.get_average_fraction():.1%} of the window per frame "
+          f"on average over {game.damage.frames} frames", file=sys.stderr)
+    print(f"Played {played} frames in {elapsed:.2f}s ({played / elapsed:.0f} frames/sec)", file=sys.stderr)
+    for state, times in game.frame_times.items():
+        if times:
+            print(f"  {state.name:<13} {len(times):>5} frames, {format_latencies(times)}", file=sys.stderr)
+    if arguments.profile:
+        game.profiler.export(arguments.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+This file consists of the location of the files the game keeps between runs, which only depends on
+the standard library so both the game and the command line tools can import it
+"""
+
+# Imports
+import os
+import sys
+
+
+def get_cache_directory():
+    """
+    Returns the directory of the game's files in the user's cache directory
+    :return: str
+    """
+
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        directory = os.environ.get("LOCALAPPDATA", home)
+    elif sys.platform == "darwin":
+        directory = os.path.join(home, "Library", "Caches")
+    else:
+        directory = os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache")
+    return os.path.join(directory, "SudokuForever")
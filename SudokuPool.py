@@ -0,0 +1,101 @@
+"""
+This file consists of a pool of pre-generated sudoku puzzles for every difficulty,
+which worker processes keep refilled in the background.
+"""
+
+# Imports
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import RLock
+from Sudoku import generate_puzzle
+
+
+class PuzzlePool:
+    """
+    This is a pool that keeps a number of ready puzzles for each difficulty.
+    Taking a puzzle is O(1), and a replacement is generated by a worker process.
+    """
+    def __init__(self, difficulties, size=3, workers=1):
+        """
+        Initializes the pool and starts generating puzzles for every difficulty
+        :param difficulties: List[int]
+        :param size: int (number of puzzles kept ready for each difficulty)
+        :param workers: int (number of worker processes)
+        """
+
+        self.size = size
+        self.puzzles = {difficulty: deque() for difficulty in difficulties}
+        self.pending = {difficulty: 0 for difficulty in difficulties}
+        self.is_closed = False
+        self._lock = RLock()
+
+        # Workers are spawned, so that they do not inherit the state of the game window
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+        for difficulty in difficulties:
+            self._refill(difficulty)
+
+    def _refill(self, difficulty):
+        """
+        Queues the generation of enough puzzles to bring the difficulty back to the pool size
+        :param difficulty: int
+        :return: None
+        """
+
+        with self._lock:
+            if self.is_closed:
+                return
+
+            missing = self.size - len(self.puzzles[difficulty]) - self.pending[difficulty]
+            for _ in range(missing):
+                self.pending[difficulty] += 1
+                future = self._executor.submit(generate_puzzle, difficulty)
+                future.add_done_callback(lambda f, d=difficulty: self._add_generated(d, f))
+
+    def _add_generated(self, difficulty, future):
+        """
+        Adds a puzzle generated by a worker to the pool
+        :param difficulty: int
+        :param future: Future
+        :return: None
+        """
+
+        with self._lock:
+            self.pending[difficulty] -= 1
+            if not future.cancelled() and future.exception() is None:
+                self.puzzles[difficulty].append(future.result())
+
+    def count(self, difficulty):
+        """
+        Returns the number of ready puzzles of a difficulty
+        :param difficulty: int
+        :return: int
+        """
+
+        return len(self.puzzles.get(difficulty, ()))
+
+    def take(self, difficulty):
+        """
+        Takes a ready puzzle of a difficulty and queues its replacement
+        :param difficulty: int
+        :return: Tuple[Board, Board] (None if there is no ready puzzle)
+        """
+
+        if difficulty not in self.puzzles:
+            return None
+
+        with self._lock:
+            puzzle = self.puzzles[difficulty].popleft() if self.puzzles[difficulty] else None
+        self._refill(difficulty)
+        return puzzle
+
+    def close(self):
+        """
+        Stops the worker processes, dropping the puzzles that are still being generated
+        :return: None
+        """
+
+        with self._lock:
+            self.is_closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,271 @@
+"""
+This file consists of the profiler of the game, which times the phases of every frame and the calls
+made to the Sudoku object, and keeps rolling histograms of the times of the last frames.
+
+The game shows the histograms in an overlay toggled with F3, and writes them to SudokuProfile.json
+and SudokuProfile.csv with F4. SudokuHeadless.py can write them too, with --profile.
+"""
+
+# Imports
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import pygame
+from SudokuStats import percentile
+
+# Upper edges of the histogram buckets, in milliseconds; the last bucket has no upper edge
+BUCKET_EDGES_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3)
+# Frames slower than this miss a frame at 60 frames per second, and are shown in red in the overlay
+SLOW_FRAME_MS = 16.7
+
+# Layout of the overlay, in pixels
+OVERLAY_COLUMNS = (0, 155, 200, 245, 290)
+OVERLAY_WIDTH = 340
+OVERLAY_PADDING = 5
+OVERLAY_BAR_HEIGHT = 30
+# Number of frames the overlay is kept for before it is made again with the new timings
+OVERLAY_REFRESH_FRAMES = 15
+
+
+class RollingHistogram:
+    """
+    This is a histogram of the last durations recorded under a name, with the number of all of them
+    """
+    def __init__(self, window):
+        """
+        Initializes an empty histogram keeping the last window durations
+        :param window: int
+        """
+
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        """
+        Records a duration
+        :param seconds: float
+        :return: None
+        """
+
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def get_buckets(self):
+        """
+        Returns the number of recent durations in every bucket of BUCKET_EDGES_MS, and above the last edge
+        :return: List[int]
+        """
+
+        buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+        for seconds in self.samples:
+            milliseconds = seconds * 1000
+            bucket = 0
+            while bucket < len(BUCKET_EDGES_MS) and milliseconds > BUCKET_EDGES_MS[bucket]:
+                bucket += 1
+            buckets[bucket] += 1
+        return buckets
+
+    def summarize(self):
+        """
+        Returns the percentiles of the recent durations in milliseconds, with the counts of all of them
+        :return: Dict[str, Any]
+        """
+
+        samples = list(self.samples)
+        return {"count": self.count,
+                "total_ms": self.total * 1000,
+                "recent": len(samples),
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p90_ms": percentile(samples, 90) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": max(samples, default=0.0) * 1000,
+                "buckets": self.get_buckets()}
+
+
+class Profiler:
+    """
+    This is a set of rolling histograms of durations, by name, in the order they were first recorded
+    """
+    def __init__(self, window=300):
+        """
+        Initializes a profiler keeping the last window durations of every name
+        :param window: int
+        """
+
+        self.window = window
+        self.histograms = {}
+
+        # Overlay, with the version of the timings it was made from
+        self.overlay = None
+        self.overlay_version = None
+
+    def record(self, name, seconds):
+        """
+        Records a duration under a name
+        :param name: str
+        :param seconds: float
+        :return: None
+        """
+
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.window)
+        histogram.add(seconds)
+
+    @contextmanager
+    def measure(self, name):
+        """
+        Records how long the body of the with statement takes under a name
+        :param name: str
+        :return: ContextManager[None]
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def instrument(self, obj, method_names, prefix):
+        """
+        Makes the object record the duration of every call to the given methods, named prefix + method name
+        :param obj: Any
+        :param method_names: Iterable[str]
+        :param prefix: str
+        :return: None
+        """
+
+        for method_name in method_names:
+            setattr(obj, method_name, self._time_calls(prefix + method_name, getattr(obj, method_name)))
+
+    def _time_calls(self, name, function):
+        """
+        Returns the function, recording the duration of every call under a name
+        :param name: str
+        :param function: Callable
+        :return: Callable
+        """
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return timed
+
+    def summarize(self):
+        """
+        Returns the summary of every histogram, by name
+        :return: Dict[str, Dict[str, Any]]
+        """
+
+        return {name: histogram.summarize() for name, histogram in self.histograms.items()}
+
+    def export(self, path):
+        """
+        Writes the summaries to a JSON file, or to a CSV file if the path ends with .csv
+        :param path: str
+        :return: None
+        """
+
+        summaries = self.summarize()
+        with open(path, "w", newline="") as file:
+            if path.lower().endswith(".csv"):
+                bucket_names = [f"<={edge}ms" for edge in BUCKET_EDGES_MS] + [f">{BUCKET_EDGES_MS[-1]}ms"]
+                writer = csv.writer(file)
+                writer.writerow(["name", "count", "total_ms", "recent", "p50_ms", "p90_ms", "p99_ms", "max_ms"] +
+                                bucket_names)
+                for name, summary in summaries.items():
+                    writer.writerow([name] + [summary[column] for column in ("count", "total_ms", "recent", "p50_ms",
+                                                                             "p90_ms", "p99_ms", "max_ms")] +
+                                    summary["buckets"])
+            else:
+                json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                           "window": self.window,
+                           "bucket_edges_ms": list(BUCKET_EDGES_MS),
+                           "timings": summaries}, file, indent=2)
+
+    def get_overlay_size(self, font):
+        """
+        Returns the size of the overlay drawn with the font, which only grows as new names are recorded
+        :param font: pygame.font.Font
+        :return: Tuple[int, int]
+        """
+
+        # A heading, a line for every name, the histogram with a line above and below it
+        lines = len(self.histograms) + 3
+        return OVERLAY_WIDTH, 2 * OVERLAY_PADDING + lines * font.get_linesize() + OVERLAY_BAR_HEIGHT
+
+    def get_overlay_version(self):
+        """
+        Returns the version of the timings shown in the overlay, which changes every OVERLAY_REFRESH_FRAMES frames
+        :return: int
+        """
+
+        frames = self.histograms.get("frame")
+        return (frames.count if frames else 0) // OVERLAY_REFRESH_FRAMES
+
+    def draw(self, surface, position, font):
+        """
+        Draws the overlay of the percentiles of every name and the histogram of the recent frame times
+        The overlay is only made again when its version changes
+        :param surface: pygame.Surface
+        :param position: Tuple[int, int]
+        :param font: pygame.font.Font
+        :return: None
+        """
+
+        version = self.get_overlay_version()
+        if self.overlay is None or version != self.overlay_version:
+            self.overlay = self._make_overlay(font)
+            self.overlay_version = version
+        surface.blit(self.overlay, position)
+
+    def _make_overlay(self, font):
+        """
+        Makes the overlay of the percentiles of every name and the histogram of the recent frame times
+        :param font: pygame.font.Font
+        :return: pygame.Surface
+        """
+
+        line_height = font.get_linesize()
+        panel = pygame.Surface(self.get_overlay_size(font), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+
+        def write(text, x, y):
+            panel.blit(font.render(text, True, (255, 255, 255)), (OVERLAY_PADDING + x, OVERLAY_PADDING + y))
+
+        # Percentiles in milliseconds
+        lines = [("ms", "p50", "p90", "p99", "max")]
+        for name, histogram in self.histograms.items():
+            summary = histogram.summarize()
+            lines.append((name,) + tuple(f"{summary[key]:.2f}" for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")))
+        for row, line in enumerate(lines):
+            for x, text in zip(OVERLAY_COLUMNS, line):
+                write(text, x, row * line_height)
+
+        # Histogram of the frame times, with the upper edges of every other bucket under it
+        top = (len(lines) + 1) * line_height
+        write("frame time histogram", 0, top - line_height)
+        frames = self.histograms.get("frame")
+        buckets = frames.get_buckets() if frames else [0] * (len(BUCKET_EDGES_MS) + 1)
+        bar_width = (OVERLAY_WIDTH - 2 * OVERLAY_PADDING) // len(buckets)
+        for bucket, count in enumerate(buckets):
+            if count:
+                height = max(1, OVERLAY_BAR_HEIGHT * count // max(buckets))
+                slow = bucket > 0 and BUCKET_EDGES_MS[bucket - 1] >= SLOW_FRAME_MS
+                pygame.draw.rect(panel, (255, 130, 134) if slow else (140, 217, 255),
+                                 (OVERLAY_PADDING + bucket * bar_width,
+                                  OVERLAY_PADDING + top + OVERLAY_BAR_HEIGHT - height, bar_width - 2, height))
+        for bucket in range(0, len(BUCKET_EDGES_MS), 2):
+            write(f"{BUCKET_EDGES_MS[bucket]:g}", (bucket + 1) * bar_width - 8, top + OVERLAY_BAR_HEIGHT)
+
+        return panel
@@ -0,0 +1,204 @@
+"""
+This file consists of the frame scheduler that paces the game loop, the glyph cache that keeps
+rendered text, and the damage tracker used by the game to redraw only the parts of the window
+that changed since the last frame.
+
+When the game is active the scheduler runs frames at a capped rate. When it is idle it blocks
+until an event arrives, or until a timer event it was asked for fires.
+
+Every frame the game describes its screen as named regions, each with a rectangle and a key
+made of the values the region is drawn from. A region whose key differs from the last frame
+is damaged. The whole window is damaged when the state changes.
+"""
+
+# Imports
+from collections import OrderedDict
+import pygame
+
+
+class FrameScheduler:
+    """
+    This is a class that decides when the next frame runs and how much time passed since the last one
+    """
+    def __init__(self, fps):
+        """
+        Initializes the scheduler with a frame rate cap
+        :param fps: int
+        """
+
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.WAKE_UP_EVENT = pygame.event.custom_type()
+
+    def wake_up_in(self, seconds):
+        """
+        Makes an idle frame wait at most the given time, with a timer event
+        :param seconds: float
+        :return: None
+        """
+
+        pygame.time.set_timer(self.WAKE_UP_EVENT, max(1, int(seconds * 1000) + 1), 1)
+
+    def next_frame(self, idle):
+        """
+        Waits for the next frame and returns its events and the seconds passed since the last frame
+        An active frame waits for the frame rate cap, an idle frame waits for an event
+        :param idle: bool
+        :return: Tuple[List[pygame.event.Event], float]
+        """
+
+        if idle:
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+            seconds = self.clock.tick() / 1000
+        else:
+            seconds = self.clock.tick(self.fps) / 1000
+            events = pygame.event.get()
+        return events, seconds
+
+
+class GlyphCache:
+    """
+    This is a bounded cache of rendered text surfaces, keyed by font, text, antialiasing and color.
+    The least recently used surface is evicted once the cache is full. Preloaded surfaces are kept
+    apart and never evicted, so changing labels cannot push them out.
+    """
+    def __init__(self, size=256):
+        """
+        Initializes an empty cache holding at most size surfaces
+        :param size: int
+        """
+
+        self.size = size
+        self.surfaces = OrderedDict()
+        self.preloaded = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """
+        Returns the text rendered in the font and color, rendering it only if it is not cached
+        Takes the same arguments as pygame.font.Font.render, with the font first
+        :param font: pygame.font.Font
+        :param text: str
+        :param antialias: bool
+        :param color: Tuple[int, int, int]
+        :return: pygame.Surface
+        """
+
+        key = (font, text, antialias, color)
+        surface = self.preloaded.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = self.surfaces[key] = font.render(text, antialias, color)
+            if len(self.surfaces) > self.size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def preload(self, font, texts, colors, antialias=True):
+        """
+        Renders every text in every color ahead of time, to be kept for as long as the cache
+        :param font: pygame.font.Font
+        :param texts: Iterable[str]
+        :param colors: Iterable[Tuple[int, int, int]]
+        :param antialias: bool
+        :return: None
+        """
+
+        for color in colors:
+            for text in texts:
+                key = (font, text, antialias, color)
+                if key not in self.preloaded:
+                    self.preloaded[key] = self.surfaces.pop(key, None) or font.render(text, antialias, color)
+
+
+class DamageTracker:
+    """
+    This is a class that finds the damaged regions of the window and keeps count of how much
+    of the window is redrawn
+    """
+    def __init__(self, size):
+        """
+        Initializes the tracker for a window of the given size
+        :param size: Tuple[int, int]
+        """
+
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.keys = {}
+        self.state = None
+
+        # Statistics
+        self.frames = 0
+        self.redrawn_fraction = 0.0
+        self.total_redrawn_fraction = 0.0
+
+    def invalidate(self):
+        """
+        Damages the whole window on the next frame
+        :return: None
+        """
+
+        self.keys = {}
+        self.state = None
+
+    def update(self, state, regions):
+        """
+        Compares the regions with the last frame and returns the damaged rectangles
+        :param state: State
+        :param regions: Dict[Hashable, Tuple[pygame.Rect, Hashable]] (name -> (rect, key))
+        :return: List[pygame.Rect]
+        """
+
+        if state != self.state:
+            self.state = state
+            self.keys = {name: key for name, (rect, key) in regions.items()}
+            damaged = [self.screen_rect]
+        else:
+            damaged = []
+            for name, (rect, key) in regions.items():
+                if name not in self.keys or self.keys[name] != key:
+                    self.keys[name] = key
+                    damaged.append(rect)
+
+        self.frames += 1
+        self.redrawn_fraction = self.get_area(damaged) / (self.screen_rect.width * self.screen_rect.height)
+        self.total_redrawn_fraction += self.redrawn_fraction
+        return damaged
+
+    @staticmethod
+    def get_clip(damaged):
+        """
+        Returns the rectangle to redraw for the damaged rectangles (the rectangle bounding all of them)
+        :param damaged: List[pygame.Rect]
+        :return: pygame.Rect
+        """
+
+        if not damaged:
+            return pygame.Rect(0, 0, 0, 0)
+        return damaged[0].unionall(damaged[1:])
+
+    def get_area(self, damaged):
+        """
+        Returns the area that is redrawn for the damaged rectangles
+        :param damaged: List[pygame.Rect]
+        :return: int
+        """
+
+        clip = self.get_clip(damaged).clip(self.screen_rect)
+        return clip.width * clip.height
+
+    def get_average_fraction(self):
+        """
+        Returns the average fraction of the window redrawn per frame
+        :return: float
+        """
+
+        return self.total_redrawn_fraction / self.frames if self.frames else 0.0
@@ -0,0 +1,129 @@
+"""
+This file consists of a command line tool that solves a stream of sudoku puzzles.
+
+Puzzles are read lazily, one 81-character line each ("." or "0" for empty positions), from files
+or standard input, and solved by a pool of worker processes. Solutions are written in the same
+order as the puzzles, as 81-character lines, with an empty line for a puzzle that has no solution.
+At most --queue-size puzzles are in flight at once, so the input is never all kept in memory.
+
+Example:
+    python SudokuGenerate.py -n 1000 | cut -d " " -f 2 | python SudokuSolve.py --backend dlx > solutions.txt
+"""
+
+# Imports
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from Sudoku import SOLVER_BACKENDS, board_from_string, board_to_string, solve_sudoku
+from SudokuStats import format_latencies
+
+
+def read_puzzles(files):
+    """
+    Yields the puzzle lines of the files, skipping blank lines
+    :param files: List[str] ("-" for standard input)
+    :return: Iterator[str]
+    """
+
+    for name in files:
+        stream = sys.stdin if name == "-" else open(name)
+        try:
+            for line in stream:
+                if line.strip():
+                    yield line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def solve_line(line, backend):
+    """
+    Solves a puzzle in a worker process
+    :param line: str
+    :param backend: str
+    :return: Tuple[str, float] (the solution or "" if there is none, seconds taken)
+    """
+
+    start = time.perf_counter()
+    try:
+        board = board_from_string(line)
+    except ValueError:
+        # A malformed line is reported like a puzzle without a solution
+        return "", time.perf_counter() - start
+    solution = board_to_string(board) if solve_sudoku(board, backend) else ""
+    return solution, time.perf_counter() - start
+
+
+def parse_arguments(arguments=None):
+    """
+    Parses the command line arguments
+    :param arguments: List[str]
+    :return: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(description="Solve a stream of sudoku puzzles.")
+    parser.add_argument("files", nargs="*", default=["-"],
+                        help="files of puzzles, one per line (default: standard input)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to write the solutions to (default: standard output)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("-q", "--queue-size", type=int, default=None,
+                        help="most puzzles in flight at once (default: 16 per job)")
+    parser.add_argument("--backend", choices=SOLVER_BACKENDS, default="dlx",
+                        help="solver used for the puzzles (default: dlx)")
+    parser.add_argument("--timings", action="store_true",
+                        help="report the solve time of every puzzle and the running throughput")
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    """
+    Solves the puzzles in order and prints the timing statistics
+    :param arguments: List[str]
+    :return: None
+    """
+
+    arguments = parse_arguments(arguments)
+    queue_size = arguments.queue_size or 16 * arguments.jobs
+    output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+    latencies = []
+    unsolved = 0
+    start = time.perf_counter()
+
+    def write_result(future):
+        nonlocal unsolved
+        solution, seconds = future.result()
+        output.write(solution + "\n")
+        latencies.append(seconds)
+        unsolved += not solution
+        if arguments.timings:
+            elapsed = time.perf_counter() - start
+            print(f"#{len(latencies)} {seconds * 1000:.2f} ms ({len(latencies) / elapsed:.1f} puzzles/sec)",
+                  file=sys.stderr)
+
+    try:
+        with ProcessPoolExecutor(arguments.jobs) as executor:
+            # Futures are kept in input order; once the queue is full the oldest one is waited on and written
+            in_flight = deque()
+            for line in read_puzzles(arguments.files):
+                if len(in_flight) >= queue_size:
+                    write_result(in_flight.popleft())
+                in_flight.append(executor.submit(solve_line, line, arguments.backend))
+            while in_flight:
+                write_result(in_flight.popleft())
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Solved {len(latencies) - unsolved} of {len(latencies)} puzzles in {elapsed:.2f}s with "
+          f"{arguments.jobs} jobs ({len(latencies) / elapsed:.1f} puzzles/sec)", file=sys.stderr)
+    print(f"  solve time {format_latencies(latencies)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+This file consists of small helpers for reporting timings of the command line tools
+"""
+
+
+def percentile(values, p):
+    """
+    Returns the p-th percentile of the values, interpolating between the nearest two
+    :param values: List[float]
+    :param p: float (between 0 and 100)
+    :return: float
+    """
+
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    rank = (len(values) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def format_latencies(values):
+    """
+    Formats the tail latencies of a list of durations (in seconds) as milliseconds
+    :param values: List[float]
+    :return: str
+    """
+
+    return "p50 {0:.2f} ms, p90 {1:.2f} ms, p99 {2:.2f} ms, max {3:.2f} ms".format(
+        percentile(values, 50) * 1000, percentile(values, 90) * 1000,
+        percentile(values, 99) * 1000, max(values, default=0.0) * 1000)